@@ -0,0 +1,107 @@
+from datetime import date
+
+
+class GroupCount:
+    """
+        Counter of registry objects grouped by the values of one or several fields,
+        kept up to date on every append and removal so a group count is read in constant time.
+    """
+
+    def __init__(self, fields, normalize=None):
+        self.fields = (fields,) if isinstance(fields, str) else tuple(fields)
+        self.normalize = normalize
+        self.counts = {}
+
+    def key_of(self, obj):
+        """
+            Returns the group of an object, a tuple of values for several fields.
+        """
+        values = [getattr(obj, field, None) for field in self.fields]
+        if self.normalize is not None:
+            values = [self.normalize(value) for value in values]
+        return values[0] if len(values) == 1 else tuple(values)
+
+    def add(self, obj):
+        """
+            Counts an object in its group.
+        """
+        key = self.key_of(obj)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def remove(self, obj):
+        """
+            Uncounts an object from its group.
+        """
+        key = self.key_of(obj)
+        count = self.counts.get(key, 0)
+        if count <= 1:
+            self.counts.pop(key, None)
+        else:
+            self.counts[key] = count - 1
+
+    def count(self, *values):
+        """
+            Returns the number of objects in the group of the given field values.
+        """
+        if self.normalize is not None:
+            values = [self.normalize(value) for value in values]
+        return self.counts.get(values[0] if len(values) == 1 else tuple(values), 0)
+
+    def __len__(self):
+        return len(self.counts)
+
+
+class AgeHistogram:
+    """
+        Histogram of people by full age in buckets of `width` years, ages are taken on the given
+        day (today by default) so the buckets stay fixed while objects are added and removed.
+        People with an unknown birthday are counted in the None bucket.
+    """
+
+    def __init__(self, width=10, on=None):
+        self.width = width
+        self.on = on or date.today()
+        self.counts = {}
+
+    def age_of(self, obj):
+        """
+            Returns the full age of a person in years, or None if the birthday is unknown.
+        """
+        if getattr(obj, 'birth_ordinal', None) is None:
+            return None
+        born = date.fromordinal(obj.birth_ordinal)
+        return self.on.year - born.year - ((self.on.month, self.on.day) < (born.month, born.day))
+
+    def key_of(self, obj):
+        """
+            Returns the lowest age of the bucket of a person.
+        """
+        age = self.age_of(obj)
+        return None if age is None else age // self.width * self.width
+
+    def add(self, obj):
+        """
+            Counts a person in its age bucket.
+        """
+        key = self.key_of(obj)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def remove(self, obj):
+        """
+            Uncounts a person from its age bucket.
+        """
+        key = self.key_of(obj)
+        count = self.counts.get(key, 0)
+        if count <= 1:
+            self.counts.pop(key, None)
+        else:
+            self.counts[key] = count - 1
+
+    def count(self, age):
+        """
+            Returns the number of people in the bucket containing the age.
+        """
+        return self.counts.get(None if age is None else age // self.width * self.width, 0)
+
+    def __len__(self):
+        return len(self.counts)
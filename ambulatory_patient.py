@@ -1,4 +1,5 @@
 from patient import Patient
+from layout import line
 
 class AmbulatoryPatient(Patient):
     """
@@ -8,6 +9,15 @@ class AmbulatoryPatient(Patient):
     AVAILABLE_DISABILITY = ['0', '1', '2', '3']
     AVAILABLE_HEALTH_GROUP = ['I', 'II', 'III']
 
+    __slots__ = ('__territorial_number', '__disability', '__health_group', 'chronic_diagnosis')
+
+    LAYOUT = (
+        line('Территориальный номер', 'territorial_number'),
+        line('Группа инвалидности', 'disability', '0'),
+        line('Группа здоровья', 'health_group'),
+        line('Хронический диагноз', 'chronic_diagnosis', 'Не выявлено'),
+    )
+
     def __init__(self, full_name, gender, birthday,
                  place_birth, married, passport,
                  residence_address, level_education, phone_number,
@@ -23,7 +33,29 @@ class AmbulatoryPatient(Patient):
         self.territorial_number = territorial_number
         self.disability = disability
         self.health_group = health_group
-        self.chronic_diagnosis = chronic_diagnosis if isinstance(chronic_diagnosis, str) else None
+        self.chronic_diagnosis = Patient._as_str(chronic_diagnosis)
+
+    @staticmethod
+    def _validate_territorial_number(value):
+        """
+            Returns the territorial number if it is between 1 and 20, otherwise None.
+        """
+        value = Patient._as_int(value)
+        return value if value is not None and 1 <= value <= 20 else None
+
+    @staticmethod
+    def _validate_disability(value):
+        """
+            Returns the disability category if it is one of the valid categories, otherwise None.
+        """
+        return value if isinstance(value, str) and value in AmbulatoryPatient.AVAILABLE_DISABILITY else None
+
+    @staticmethod
+    def _validate_health_group(value):
+        """
+            Returns the health group if it is one of the valid groups, otherwise None.
+        """
+        return value if isinstance(value, str) and value in AmbulatoryPatient.AVAILABLE_HEALTH_GROUP else None
 
     @property
     def territorial_number(self):
@@ -51,40 +83,21 @@ class AmbulatoryPatient(Patient):
         """
             Sets the territorial number, ensuring it is an integer between 1 and 20.
         """
-        if isinstance(value, int) and 1 <= int(value) <= 20:
-            self.__territorial_number = value
-        else:
-            self.__territorial_number = None
+        self.__territorial_number = AmbulatoryPatient._validate_territorial_number(value)
 
     @disability.setter
     def disability(self, value):
         """
             Sets the disability category, ensuring it is one of the valid categories.
         """
-        if isinstance(value, int) and value in AmbulatoryPatient.AVAILABLE_DISABILITY:
-            self.__disability = value
-        else:
-            self.__disability = None
+        self.__disability = AmbulatoryPatient._validate_disability(value)
 
     @health_group.setter
     def health_group(self, value):
         """
             Sets the health group, ensuring it is one of the valid groups.
         """
-        if isinstance(value, int) and value in AmbulatoryPatient.AVAILABLE_HEALTH_GROUP:
-            self.__health_group = value
-        else:
-            self.__health_group = None
-
-    def __str__(self):
-        patient_info = super().__str__()
-
-        territorial = f'Территориальный номер: {self.territorial_number}\n' if self.territorial_number else ''
-        disability = f'Группа инвалидности: {self.disability}\n' if self.__disability and self.disability != '0' else ''
-        health = f'Группа здоровья: {self.health_group}\n' if self.health_group else ''
-        diagnosis = f'Хронический диагноз: {self.chronic_diagnosis}\n' if self.chronic_diagnosis and self.chronic_diagnosis != 'Не выявлено' else ''
-
-        return ''.join([patient_info, territorial, disability, health, diagnosis])
+        self.__health_group = AmbulatoryPatient._validate_health_group(value)
 
     def __repr__(self):
         return super().__repr__()
@@ -0,0 +1,144 @@
+from person import Person
+from patient import Patient
+from ambulatory_patient import AmbulatoryPatient
+from employee import Employee
+from doctor import Doctor
+from decoder import RowDecoder, _keep
+
+BATCH_SIZE = 4096
+
+
+def iter_batches(rows, size=BATCH_SIZE):
+    """
+        Yields lists of up to `size` consecutive rows.
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _members(allowed, strings_only):
+    """
+        Returns a column check keeping the values found in `allowed`, only string values
+        when `strings_only` is set, like the `value in LIST` checks of the setters.
+    """
+    allowed_set = frozenset(allowed)
+
+    def check(values):
+        if strings_only:
+            return [value if isinstance(value, str) and value in allowed_set else None for value in values]
+        return [value if value in allowed_set else None for value in values]
+    return check
+
+
+def _pattern(pattern, strings_only):
+    """
+        Returns a column check keeping the values the precompiled pattern fully matches.
+    """
+    match = pattern.fullmatch
+
+    def check(values):
+        if strings_only:
+            return [value if isinstance(value, str) and match(value) else None for value in values]
+        return [value if match(value) else None for value in values]
+    return check
+
+
+def _bounded(low, high):
+    """
+        Returns a column check turning values into integers and keeping those between low and high inclusive.
+    """
+    as_int = Person._as_int
+
+    def check(values):
+        numbers = [as_int(value) for value in values]
+        return [number if number is not None and low <= number <= high else None for number in numbers]
+    return check
+
+
+def _full_names(values):
+    """
+        Column version of the full name check.
+    """
+    return [value[:25] if isinstance(value, str) else None for value in values]
+
+
+def _strings(values):
+    """
+        Column version of `Person._as_str`.
+    """
+    return [value if isinstance(value, str) else None for value in values]
+
+
+def _bools(values):
+    """
+        Column version of `Person._as_bool`.
+    """
+    return [value if isinstance(value, bool) else None for value in values]
+
+
+def _unchanged(values):
+    """
+        Column version of the fields stored without any check.
+    """
+    return list(values)
+
+
+# Column versions of the setter checks, each returns for every value exactly what the setter check returns.
+COLUMN_CHECKS = {
+    Person._validate_full_name: _full_names,
+    Person._validate_gender: _members(Person.VALID_GENDERS, True),
+    Person._validate_birthday: _pattern(Person.BIRTHDAY_PATTERN, True),
+    Person._validate_passport: _pattern(Person.PASSPORT_PATTERN, True),
+    Person._validate_level_education: _members(Person.VALID_EDUCATION, True),
+    Person._validate_phone_number: _pattern(Person.PHONE_PATTERN, True),
+    Patient._validate_status: _members(Patient.AVAILABLE_STATUS, False),
+    Patient._validate_blood_type: _members(Patient.AVAILABLE_BLOOD_TYPES, False),
+    Patient._validate_rhesus_affiliation: _members(Patient.AVAILABLE_RHESUS_AFFILIATION, False),
+    AmbulatoryPatient._validate_territorial_number: _bounded(1, 20),
+    AmbulatoryPatient._validate_disability: _members(AmbulatoryPatient.AVAILABLE_DISABILITY, True),
+    AmbulatoryPatient._validate_health_group: _members(AmbulatoryPatient.AVAILABLE_HEALTH_GROUP, True),
+    Employee._validate_year_graduation: _bounded(1950, 2030),
+    Employee._validate_work_experience: _bounded(0, 60),
+    Employee._validate_profession: _members(Employee.AVAILABLE_PROFESSIONS, True),
+    Doctor._validate_category: _members(Doctor.AVAILABLE_CATEGORIES, True),
+    Person._as_str: _strings,
+    Person._as_bool: _bools,
+    _keep: _unchanged,
+}
+
+
+def validate_column(check, values):
+    """
+        Validates a whole column of raw values with the column version of a setter check,
+        falling back to calling the check on every value when it has no column version.
+    """
+    column_check = COLUMN_CHECKS.get(check)
+    if column_check is None:
+        return [check(value) for value in values]
+    return column_check(values)
+
+
+def validate_rows(cls, rows):
+    """
+        Validates split rows of the right arity for cls column by column.
+        Returns the validated columns in constructor order.
+    """
+    if not rows:
+        return [[] for _ in RowDecoder.for_class(cls).fields]
+    return [validate_column(check, column)
+            for check, column in zip(RowDecoder.for_class(cls).validators, zip(*rows))]
+
+
+def validate_chunk(cls, rows):
+    """
+        Returns the (offset, values) rows of the (offset, split row) rows, validated column by column.
+    """
+    offsets = [offset for offset, _ in rows]
+    columns = validate_rows(cls, [args for _, args in rows])
+    return list(zip(offsets, map(list, zip(*columns))))
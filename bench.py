@@ -0,0 +1,381 @@
+import inspect
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from hospital_patient import HospitalPatient
+from ambulatory_patient import AmbulatoryPatient
+from nurse import Nurse
+from doctor import Doctor
+from loader import Loader
+from registry import Registry
+from indexes import NGramIndex
+from decoder import RowDecoder
+from reader import MappedReader
+from snapshot import SnapshotCache
+from parallel import parse_file
+from flyweight import FLYWEIGHTS
+from render import render_all
+
+FILES = [
+    ('hospital.txt', HospitalPatient),
+    ('ambulatory.txt', AmbulatoryPatient),
+    ('nurses.txt', Nurse),
+    ('doctors.txt', Doctor),
+]
+
+ROWS = 20000
+
+
+def make_sample(file, rows=ROWS):
+    """
+        Writes a temporary copy of a sample file repeated up to the given number of rows
+        and returns its path.
+    """
+    with open(file, 'r', encoding='utf-8') as data:
+        lines = [line.rstrip('\n') + '\n' for line in data if line.strip()]
+
+    handle, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(handle, 'w', encoding='utf-8') as out:
+        for i in range(rows):
+            out.write(lines[i % len(lines)])
+    return path
+
+
+def legacy_loader(file, cls):
+    """
+        The per-row loop used before compiled decoders, kept as the baseline for comparisons.
+    """
+    objects = []
+    with open(file, 'r', encoding='utf-8') as data:
+        for raw in data.readlines():
+            args = raw.strip().split(';')
+            if args[-1] == '':
+                args = args[:-1]
+
+            args = [True if arg.lower() == 'true' or arg.lower() == 'да' else False
+            if arg.lower() == 'false' or arg.lower() == 'нет' else arg for arg in args]
+
+            need_args = len(inspect.signature(cls.__init__).parameters) - 1
+
+            if len(args) != need_args:
+                continue
+
+            objects.append(cls(*args))
+    return objects
+
+
+def timed(func, *args):
+    """
+        Returns the result of a call and the seconds it took.
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_decoders():
+    """
+        Prints rows per second of the legacy loop and the compiled decoders for each file type.
+    """
+    print('Декодеры строк (строк/с):')
+    for file, cls in FILES:
+        path = make_sample(file)
+        try:
+            before, before_time = timed(legacy_loader, path, cls)
+            after, after_time = timed(Loader.loader, path, cls)
+        finally:
+            os.remove(path)
+        print(f'  {cls.__name__:<18} до: {len(before) / before_time:>10.0f}  '
+              f'после: {len(after) / after_time:>10.0f}  '
+              f'x{before_time / after_time:.1f}')
+
+
+def bench_registry():
+    """
+        Prints rows per second of the legacy loop, of Loader.loader alone and of a registry load
+        with the lazy indexes left unbuilt and with every index built at once.
+    """
+    print('Загрузка в реестр (строк/с):')
+    for file, cls in FILES:
+        path = make_sample(file)
+        try:
+            before, before_time = timed(legacy_loader, path, cls)
+            objects, loader_time = timed(Loader.loader, path, cls)
+        finally:
+            os.remove(path)
+        _, lazy_time = timed(Registry, objects, cls)
+        _, eager_time = timed(lambda: Registry(objects, cls, lazy=()))
+        rows = len(before)
+        print(f'  {cls.__name__:<18} до: {rows / before_time:>8.0f}  Loader.loader: {rows / loader_time:>8.0f}  '
+              f'реестр: {rows / (loader_time + lazy_time):>8.0f}  '
+              f'со всеми индексами: {rows / (loader_time + eager_time):>8.0f}')
+
+
+def text_rows(file, cls):
+    """
+        Counts the rows of the right arity with the text-mode loop the mmap reader replaced:
+        every line is decoded and split as a whole.
+    """
+    decoder = RowDecoder.for_class(cls)
+    with open(file, 'r', encoding='utf-8') as data:
+        return sum(1 for args in map(decoder.split, data) if len(args) == decoder.arity)
+
+
+def mapped_rows(file, cls, fields=None):
+    """
+        Counts the rows of the right arity read by the mmap reader, decoding only the given fields.
+    """
+    return sum(1 for _ in MappedReader(file).iter_rows(cls, fields))
+
+
+def bench_reader(rows=200000, fields=('passport',)):
+    """
+        Prints rows per second of the text loop and of the mmap reader with all fields and with a few of them.
+    """
+    path = make_sample('hospital.txt', rows)
+    try:
+        _, text_time = timed(text_rows, path, HospitalPatient)
+        _, all_time = timed(mapped_rows, path, HospitalPatient)
+        _, picked_time = timed(mapped_rows, path, HospitalPatient, list(fields))
+    finally:
+        os.remove(path)
+    print(f'Чтение {rows} строк (строк/с): текст {rows / text_time:.0f}, mmap {rows / all_time:.0f}, '
+          f'mmap {", ".join(fields)} {rows / picked_time:.0f} x{text_time / picked_time:.1f}')
+
+
+def slot_state(obj, cls):
+    """
+        Returns (attribute, value) pairs of the object for every slot declared along the MRO of cls.
+    """
+    state = []
+    for klass in cls.__mro__:
+        for slot in vars(klass).get('__slots__', ()):
+            key = f'_{klass.__name__}{slot}' if slot.startswith('__') else slot
+            state.append((key, getattr(obj, key)))
+    return state
+
+
+def bytes_per_object(cls, state, count=10000):
+    """
+        Returns the average number of bytes allocated for an instance of cls holding the given state.
+    """
+    objects = [None] * count
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        obj = object.__new__(cls)
+        for key, value in state:
+            setattr(obj, key, value)
+        objects[i] = obj
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / count
+
+
+def bench_memory():
+    """
+        Prints bytes per object of every class of the hierarchy with __slots__ and with a __dict__.
+    """
+    print('Память на объект (байт):')
+    seen = set()
+    for file, leaf in FILES:
+        decoder = RowDecoder.for_class(leaf)
+        with open(file, 'r', encoding='utf-8') as data:
+            obj = decoder.decode(decoder.split(data.readline()))
+
+        for cls in leaf.__mro__[-2::-1]:
+            if cls in seen:
+                continue
+            seen.add(cls)
+
+            state = slot_state(obj, cls)
+            slotted = bytes_per_object(cls, state)
+            plain = bytes_per_object(type(cls.__name__, (), {}), state)
+            print(f'  {cls.__name__:<18} __slots__: {slotted:>6.0f}  __dict__: {plain:>6.0f}')
+
+
+def bench_parallel(rows=200000, workers=4):
+    """
+        Prints the time of a sequential and a parallel load of a large hospital file.
+    """
+    path = make_sample('hospital.txt', rows)
+    try:
+        _, sequential = timed(Loader.loader, path, HospitalPatient)
+        _, parallel = timed(Loader.loader, path, HospitalPatient, workers)
+    finally:
+        os.remove(path)
+    print(f'Параллельная загрузка {rows} строк: последовательно {sequential:.2f} с, '
+          f'{workers} процесса {parallel:.2f} с')
+
+
+def bench_snapshot():
+    """
+        Prints rows per second of a load that parses the file and of a load from its snapshot,
+        and checks that loading a fresh snapshot, with and without creating objects, is faster than parsing.
+    """
+    print('Снимки (строк/с):')
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SnapshotCache(directory)
+        for file, cls in FILES:
+            path = make_sample(file)
+            try:
+                before, before_time = timed(cache.load, path, cls)
+                after, after_time = timed(cache.load, path, cls)
+                (rows, _), parse_time = timed(parse_file, path, cls)
+                _, read_time = timed(cache.read_rows, path, cls)
+            finally:
+                os.remove(path)
+            print(f'  {cls.__name__:<18} разбор: {len(before) / before_time:>10.0f}  '
+                  f'снимок: {len(after) / after_time:>10.0f}  '
+                  f'строки без объектов: разбор {len(rows) / parse_time:>8.0f}, снимок {len(rows) / read_time:>8.0f}')
+            assert after_time < before_time and read_time < parse_time, \
+                f'снимок {cls.__name__} загружается медленнее разбора'
+
+
+def string_bytes(objects, field):
+    """
+        Returns the bytes taken by the distinct string objects the objects reference in the field.
+    """
+    seen = {}
+    for obj in objects:
+        value = getattr(obj, field, None)
+        if isinstance(value, str):
+            seen[id(value)] = sys.getsizeof(value)
+    return sum(seen.values())
+
+
+def bench_interning():
+    """
+        Prints the bytes taken by the strings of every pooled field without and with the flyweight pool.
+    """
+    print('Общие строки (байт на поле):')
+    for file, cls in FILES:
+        path = make_sample(file)
+        try:
+            before = legacy_loader(path, cls)
+            after = Loader.loader(path, cls)
+        finally:
+            os.remove(path)
+        for field in FLYWEIGHTS.fields:
+            if not hasattr(after[0], field):
+                continue
+            copies, pooled = string_bytes(before, field), string_bytes(after, field)
+            print(f'  {cls.__name__:<18} {field:<20} копии: {copies:>9}  пул: {pooled:>7}  '
+                  f'экономия: {copies - pooled:>9}')
+
+
+def bench_render():
+    """
+        Prints records per second written with print() one by one and with the bulk renderer.
+    """
+    print('Вывод записей (записей/с):')
+    for file, cls in FILES:
+        path = make_sample(file)
+        try:
+            objects = Loader.loader(path, cls)
+        finally:
+            os.remove(path)
+        with open(os.devnull, 'w', encoding='utf-8') as out:
+            _, before_time = timed(lambda: [print(obj, file=out) for obj in objects])
+            _, after_time = timed(render_all, objects, out)
+        print(f'  {cls.__name__:<18} print: {len(objects) / before_time:>10.0f}  '
+              f'шаблоны: {len(objects) / after_time:>10.0f}  x{before_time / after_time:.1f}')
+
+
+def sample_names(count, seed=1):
+    """
+        Returns `count` full names made of random surnames, first names and patronymics of the sample files.
+    """
+    parts = ([], [], [])
+    for file, _ in FILES:
+        with open(file, 'r', encoding='utf-8') as data:
+            for line in data:
+                words = line.split(';')[0].split()
+                if len(words) == 3:
+                    for words_of, word in zip(parts, words):
+                        words_of.append(word)
+    choice = random.Random(seed).choice
+    return [' '.join(choice(words) for words in parts) for _ in range(count)]
+
+
+def name_index(objects):
+    """
+        Returns a trigram index of the full names of the objects.
+    """
+    index = NGramIndex()
+    for obj in objects:
+        index.add(obj)
+    return index
+
+
+def bench_search(names=200000, queries=50):
+    """
+        Prints the build time and memory of the trigram index over many names and the time of
+        a fuzzy and a prefix search against a substring and a startswith scan over all names.
+    """
+    path = make_sample('hospital.txt', names)
+    try:
+        objects = Loader.loader(path, HospitalPatient)
+    finally:
+        os.remove(path)
+    for obj, name in zip(objects, sample_names(names)):
+        obj.full_name = name
+
+    _, build_time = timed(name_index, objects)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    index = name_index(objects)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    sample = random.Random(2).sample([obj.full_name for obj in objects], queries)
+    typos = [name[:len(name) // 2] + name[len(name) // 2 + 1:] for name in sample]
+    prefixes = [name[:7] for name in sample]
+    lowered = [obj.full_name.lower() for obj in objects]
+    _, search_time = timed(lambda: [index.search(query) for query in typos])
+    _, scan_time = timed(lambda: [[name for name in lowered if query.lower() in name] for query in typos])
+    _, prefix_time = timed(lambda: [index.prefix(query) for query in prefixes])
+    _, starts_time = timed(lambda: [[name for name in lowered if name.startswith(query.lower())] for query in prefixes])
+    print(f'Поиск по ФИО ({len(objects)} имён): индекс за {build_time:.2f} с, {memory / len(objects):.0f} байт на запись; '
+          f'нечёткий {search_time / queries * 1000:.1f} мс (перебор подстрокой {scan_time / queries * 1000:.1f} мс), '
+          f'по началу {prefix_time / queries * 1000:.1f} мс (перебор {starts_time / queries * 1000:.1f} мс)')
+
+
+def bench_admission(checks=100000):
+    """
+        Prints the speed of negative admission checks with the exact index alone, with Registry.registered
+        and with the Bloom filter prefilter, with the memory and false positive rate of the filter.
+    """
+    path = make_sample('hospital.txt')
+    try:
+        registry = Registry(Loader.loader(path, HospitalPatient), HospitalPatient)
+    finally:
+        os.remove(path)
+    passports = [f'{i % 10000:04} {i:06} 01.01.2000' for i in range(checks)]
+
+    index = registry.index('passport')
+    _, exact_time = timed(lambda: [index.find(passport) for passport in passports])
+    _, registered_time = timed(lambda: [registry.registered(passport) for passport in passports])
+    _, filtered_time = timed(lambda: [registry.registered(passport, prefilter=True) for passport in passports])
+    stats = registry.index('known_keys').stats()
+    print(f'Проверка при поступлении ({checks} новых паспортов): индекс {checks / exact_time:.0f}/с, '
+          f'registered {checks / registered_time:.0f}/с, '
+          f'с фильтром Блума {checks / filtered_time:.0f}/с, {stats["bytes"]} байт, '
+          f'ложных срабатываний {stats["observed_false_positive_rate"]:.4f} '
+          f'(ожидалось {stats["expected_false_positive_rate"]:.4f})')
+
+
+if __name__ == '__main__':
+    bench_decoders()
+    bench_registry()
+    bench_reader()
+    bench_memory()
+    bench_parallel()
+    bench_snapshot()
+    bench_search()
+    bench_admission()
+    bench_interning()
+    bench_render()
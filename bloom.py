@@ -0,0 +1,171 @@
+import math
+from keys import normalize_passport, normalize_policy
+
+
+class BloomFilter:
+    """
+        Fixed-size Bloom filter of hashable keys. A key that was added is always reported as present,
+        a key that was not is reported as present with about `error_rate` probability
+        while no more than `capacity` keys were added.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def digest(key):
+        """
+            Returns the two hashes of a key all bit positions are derived from, the low and the high half
+            of a single hash of the key. The filter lives in memory only, so the per-process hash is enough
+            and much cheaper than hashlib.
+        """
+        value = hash(key)
+        return value & 0xFFFFFFFF, (value >> 32) | 1
+
+    def positions(self, digest):
+        """
+            Returns the bit positions of a key digest.
+        """
+        first, step = digest
+        size = self.size
+        return [(first + i * step) % size for i in range(self.hashes)]
+
+    def add_digest(self, digest):
+        """
+            Sets the bits of a key digest.
+        """
+        bits = self.bits
+        for position in self.positions(digest):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def has_digest(self, digest):
+        """
+            Checks whether all the bits of a key digest are set.
+        """
+        bits = self.bits
+        first, step = digest
+        size = self.size
+        for i in range(self.hashes):
+            position = (first + i * step) % size
+            if not bits[position >> 3] & 1 << (position & 7):
+                return False
+        return True
+
+    def add(self, key):
+        """
+            Adds a key.
+        """
+        self.add_digest(BloomFilter.digest(key))
+
+    def __contains__(self, key):
+        return self.has_digest(BloomFilter.digest(key))
+
+    def false_positive_rate(self):
+        """
+            Returns the expected false positive rate for the number of keys added so far.
+        """
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def memory(self):
+        """
+            Returns the size of the bit array in bytes.
+        """
+        return len(self.bits)
+
+
+class KeyFilter:
+    """
+        Growing Bloom filter of the passport and medical policy keys of registry objects,
+        used as a registry index to answer "surely not registered" without touching the exact indexes.
+        When a layer is full a four times larger one with half the error rate is added, so the total
+        false positive rate stays below twice `error_rate`. Keys of removed objects stay in the filter,
+        which only makes false positives a bit more likely.
+    """
+
+    FIELDS = {'passport': normalize_passport, 'medical_policy': normalize_policy}
+    INITIAL_CAPACITY = 1024
+    GROWTH = 4
+
+    def __init__(self, error_rate=0.01):
+        self.error_rate = error_rate
+        self.layers = [BloomFilter(KeyFilter.INITIAL_CAPACITY, error_rate / 2)]
+        self.checks = 0
+        self.passed = 0
+        self.false_positives = 0
+
+    @staticmethod
+    def key(field, value):
+        """
+            Returns the filter key of a field value, or None if it has no usable key.
+        """
+        normalized = KeyFilter.FIELDS[field](value)
+        return None if normalized is None else (field, normalized)
+
+    def add(self, obj):
+        """
+            Adds the passport and medical policy keys of an object, keys that already pass the filter
+            are not added again so repeated values do not fill it up.
+        """
+        for field in KeyFilter.FIELDS:
+            key = KeyFilter.key(field, getattr(obj, field, None))
+            if key is None:
+                continue
+            digest = BloomFilter.digest(key)
+            if any(layer.has_digest(digest) for layer in self.layers):
+                continue
+            layer = self.layers[-1]
+            if layer.count >= layer.capacity:
+                layer = BloomFilter(layer.capacity * KeyFilter.GROWTH, layer.error_rate / 2)
+                self.layers.append(layer)
+            layer.add_digest(digest)
+
+    def remove(self, obj):
+        """
+            Bloom filters cannot forget keys, removed objects stay in the filter.
+        """
+
+    def might_contain(self, field, value):
+        """
+            Returns False if no object has the field value for sure, True if one may have it.
+        """
+        key = KeyFilter.key(field, value)
+        self.checks += 1
+        if key is None:
+            return False
+        digest = BloomFilter.digest(key)
+        for layer in self.layers:
+            if layer.has_digest(digest):
+                self.passed += 1
+                return True
+        return False
+
+    def record_miss(self):
+        """
+            Counts a key the filter let through but the exact index did not find.
+        """
+        self.false_positives += 1
+
+    def stats(self):
+        """
+            Returns the number of keys, the memory used by the bit arrays in bytes,
+            the expected false positive rate and the observed counters of the filter.
+        """
+        rate = 1 - math.prod(1 - layer.false_positive_rate() for layer in self.layers)
+        return {
+            'keys': sum(layer.count for layer in self.layers),
+            'bytes': sum(layer.memory() for layer in self.layers),
+            'expected_false_positive_rate': rate,
+            'checks': self.checks,
+            'passed': self.passed,
+            'false_positives': self.false_positives,
+            'observed_false_positive_rate': self.false_positives / max(1, self.checks - self.passed + self.false_positives),
+        }
+
+    def __len__(self):
+        return sum(layer.count for layer in self.layers)
@@ -0,0 +1,161 @@
+import inspect
+from itertools import product
+from person import Person
+from flyweight import FLYWEIGHTS
+
+
+def _case_variants(word):
+    """
+        Returns every upper/lower case spelling of a word.
+    """
+    return {''.join(chars) for chars in product(*((c.lower(), c.upper()) for c in word))}
+
+
+BOOL_TOKENS = {}
+for _word, _value in (('true', True), ('да', True), ('false', False), ('нет', False)):
+    BOOL_TOKENS.update(dict.fromkeys(_case_variants(_word), _value))
+
+PLAIN_FIELDS = {
+    'place_birth': Person._as_str,
+    'married': Person._as_bool,
+    'residence_address': Person._as_str,
+    'know_foreign_language': Person._as_bool,
+    'education_document': Person._as_str,
+    'qualification': Person._as_str,
+    'specialty': Person._as_str,
+    'academic_degree': Person._as_bool,
+    'academic_rank': Person._as_bool,
+    'trainings': Person._as_bool,
+    'medical_errors': Person._as_bool,
+    'diagnosis_patients': Person._as_bool,
+    'treatment_patients': Person._as_bool,
+    'rehabilitation_patients': Person._as_bool,
+    'sanitary_service': Person._as_bool,
+    'patient_care': Person._as_bool,
+    'medical_procedures': Person._as_bool,
+    'chronic_diagnosis': Person._as_str,
+}
+
+ID_KEY = '_Person__id'
+
+
+def _keep(value):
+    """
+        Returns the value unchanged, for fields stored without any check.
+    """
+    return value
+
+
+class RowDecoder:
+    """
+        Turns rows of a registry file into instances of one class.
+        The field layout, the slot of every field and the fields derived from them
+        (see `Person.DERIVED_FIELDS`) are resolved once per class, use `RowDecoder.for_class`
+        to get a cached decoder. Strings of the fields pooled in `FLYWEIGHTS` are shared between objects.
+    """
+
+    _cache = {}
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.fields = list(inspect.signature(cls.__init__).parameters)[1:]
+        self.arity = len(self.fields)
+        self.keys = []
+        self.validators = []
+
+        for field in self.fields:
+            owner = RowDecoder._property_owner(cls, field)
+            if owner is None:
+                self.keys.append(field)
+                self.validators.append(PLAIN_FIELDS.get(field, _keep))
+            else:
+                self.keys.append(f'_{owner.__name__}__{field}')
+                self.validators.append(getattr(owner, f'_validate_{field}'))
+
+        self._set_id = getattr(cls, ID_KEY).__set__
+        self._setters = [getattr(cls, key).__set__ for key in self.keys]
+
+        self._derived = []
+        for field, (name, derive) in getattr(cls, 'DERIVED_FIELDS', {}).items():
+            owner = RowDecoder._property_owner(cls, name)
+            store = getattr(cls, f'_{owner.__name__}__{name}').__set__
+            self._derived.append((store, derive, self.fields.index(field)))
+
+        self._pooled = [(position, FLYWEIGHTS.table(field)) for position, field in enumerate(self.fields)
+                        if FLYWEIGHTS.table(field) is not None]
+
+    @staticmethod
+    def _property_owner(cls, name):
+        """
+            Returns the class along the MRO of cls that defines the property, or None.
+        """
+        return next((klass for klass in cls.__mro__ if isinstance(vars(klass).get(name), property)), None)
+
+    @staticmethod
+    def for_class(cls):
+        """
+            Returns the decoder of the specified class, building it on first use.
+        """
+        decoder = RowDecoder._cache.get(cls)
+        if decoder is None:
+            decoder = RowDecoder._cache[cls] = RowDecoder(cls)
+        return decoder
+
+    @staticmethod
+    def split(raw):
+        """
+            Splits a raw line into fields and turns true/да/false/нет in any case into booleans.
+        """
+        args = raw.strip().split(';')
+        if args[-1] == '':
+            args.pop()
+        return [BOOL_TOKENS.get(arg, arg) for arg in args]
+
+    def validate(self, args):
+        """
+            Returns the validated values of a split row in constructor order.
+        """
+        return [check(arg) for check, arg in zip(self.validators, args)]
+
+    def decode(self, args, origin=None):
+        """
+            Creates an instance from a split row of the right arity without calling the constructor chain.
+            The origin is the (file, offset) of the row, passed on to the person number allocator.
+        """
+        obj = object.__new__(self.cls)
+        self._set_id(obj, Person._next_id(origin))
+        values = [check(arg) for check, arg in zip(self.validators, args)]
+        for position, table in self._pooled:
+            value = values[position]
+            if value.__class__ is str:
+                values[position] = table[value]
+        for store, value in zip(self._setters, values):
+            store(obj, value)
+        for store, derive, position in self._derived:
+            store(obj, derive(values[position]))
+        return obj
+
+    def build(self, values, _id):
+        """
+            Creates an instance with the given number from already validated values.
+            Strings of the pooled fields are replaced in `values` by their pooled copies before they are stored.
+        """
+        obj = object.__new__(self.cls)
+        self._set_id(obj, _id)
+        for position, table in self._pooled:
+            value = values[position]
+            if value.__class__ is str:
+                values[position] = table[value]
+        for store, value in zip(self._setters, values):
+            store(obj, value)
+        for store, derive, position in self._derived:
+            store(obj, derive(values[position]))
+        return obj
+
+    def build_rows(self, file, rows):
+        """
+            Creates instances from the (offset, values) rows of the file, numbered in row order
+            from a block of numbers reserved once for all the rows.
+        """
+        allocate = Person._row_allocator(len(rows)).allocate
+        return [self.build(values, allocate((file, offset))) for offset, values in rows]
@@ -0,0 +1,106 @@
+from hospital_patient import HospitalPatient
+from ambulatory_patient import AmbulatoryPatient
+from reader import MappedReader
+from keys import normalize_name, normalize_phone, normalize_policy, passport_number, birthday_ordinal
+
+JOIN_FIELDS = ('full_name', 'birthday', 'passport', 'phone_number', 'medical_policy')
+
+
+def join_keys(values):
+    """
+        Returns the join keys of a record as a dict: the passport series and number, the medical policy
+        and the normalized full name with the birthday. Keys that cannot be built from dirty values are left out.
+    """
+    keys = {}
+    passport = passport_number(values.get('passport'))
+    if passport is not None:
+        keys['passport'] = passport
+    policy = normalize_policy(values.get('medical_policy'))
+    if policy is not None:
+        keys['medical_policy'] = policy
+    name, born = normalize_name(values.get('full_name')), birthday_ordinal(values.get('birthday'))
+    if name is not None and born is not None:
+        keys['name_birthday'] = (name, born)
+    return keys
+
+
+def file_records(file, cls, rejected=None):
+    """
+        Yields the byte offset and the raw join fields of every row of a registry file,
+        so dirty passports and birthdays that validation would drop still take part in the join.
+    """
+    for offset, args in MappedReader(file).iter_rows(cls, JOIN_FIELDS, rejected=rejected):
+        yield offset, dict(zip(JOIN_FIELDS, args))
+
+
+def registry_records(registry):
+    """
+        Yields every object of a registry with its validated join fields.
+    """
+    for obj in registry:
+        yield obj, {field: getattr(obj, field, None) for field in JOIN_FIELDS}
+
+
+class JoinPair:
+    """
+        Pair of records of the same person found by a join: `matched` names the keys they share,
+        `conflicts` the keys and the phone number both records have but with different values.
+    """
+
+    def __init__(self, left, right, left_values, right_values, matched, conflicts):
+        self.left = left
+        self.right = right
+        self.left_values = left_values
+        self.right_values = right_values
+        self.matched = matched
+        self.conflicts = conflicts
+
+    @property
+    def is_conflict(self):
+        """
+            Checks whether the records disagree on some key or on the phone number.
+        """
+        return bool(self.conflicts)
+
+    def __repr__(self):
+        return f'JoinPair({self.left!r}, {self.right!r}, matched={self.matched}, conflicts={self.conflicts})'
+
+
+def hash_join(left, right):
+    """
+        Yields a JoinPair for every left and right record sharing at least one join key.
+        The left records are hashed by each key once, the right records are streamed and probed,
+        so the join is linear in the size of both sides.
+    """
+    built = []
+    tables = {}
+    for ref, values in left:
+        keys = join_keys(values)
+        position = len(built)
+        built.append((ref, values, keys))
+        for name, key in keys.items():
+            tables.setdefault(name, {}).setdefault(key, []).append(position)
+
+    for ref, values in right:
+        keys = join_keys(values)
+        found = {}
+        for name, key in keys.items():
+            for position in tables.get(name, {}).get(key, ()):
+                found.setdefault(position, []).append(name)
+
+        phone = normalize_phone(values.get('phone_number'))
+        for position, matched in found.items():
+            left_ref, left_values, left_keys = built[position]
+            conflicts = [name for name, key in keys.items() if name in left_keys and left_keys[name] != key]
+            left_phone = normalize_phone(left_values.get('phone_number'))
+            if phone is not None and left_phone is not None and phone != left_phone:
+                conflicts.append('phone_number')
+            yield JoinPair(left_ref, ref, left_values, values, tuple(matched), tuple(conflicts))
+
+
+def match_patient_files(hospital_file, ambulatory_file):
+    """
+        Yields the pairs of hospital and ambulatory patient rows of the same person, joining the raw rows
+        of both files, the left and right references are the byte offsets of the rows.
+    """
+    return hash_join(file_records(hospital_file, HospitalPatient), file_records(ambulatory_file, AmbulatoryPatient))
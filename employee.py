@@ -1,4 +1,5 @@
 from person import Person
+from layout import line
 
 class Employee(Person):
     """
@@ -7,6 +8,20 @@ class Employee(Person):
 
     AVAILABLE_PROFESSIONS = ['врач', 'медсестра', 'медицинская сестра']
 
+    __slots__ = ('know_foreign_language', 'education_document', '__year_graduation',
+                 'qualification', 'specialty', '__profession', '__work_experience')
+
+    LAYOUT = (
+        """f'Знание иностранного языка: {{"да" if {know_foreign_language} == "True" """
+        """else "нет" if {know_foreign_language} == "False" else ""}}\\n'""",
+        line('Документ об образовании', 'education_document'),
+        line('Год окончания', 'year_graduation'),
+        line('Квалификация', 'qualification'),
+        line('Специальность', 'specialty'),
+        line('Профессия', 'profession'),
+        line('Опыт работы', 'work_experience'),
+    )
+
     def __init__(self, full_name, gender, birthday, place_birth, married,
                  passport, residence_address,
                  level_education, phone_number,
@@ -16,14 +31,37 @@ class Employee(Person):
         super().__init__(full_name, gender, birthday, place_birth, married, passport, residence_address,
                          level_education, phone_number)
 
-        self.know_foreign_language = know_foreign_language if isinstance(know_foreign_language, bool) else None
-        self.education_document = education_document if isinstance(education_document, str) else None
+        self.know_foreign_language = Person._as_bool(know_foreign_language)
+        self.education_document = Person._as_str(education_document)
         self.year_graduation = year_graduation
-        self.qualification = qualification if isinstance(qualification, str) else None
-        self.specialty = specialty if isinstance(specialty, str) else None
+        self.qualification = Person._as_str(qualification)
+        self.specialty = Person._as_str(specialty)
         self.profession = profession
         self.work_experience = work_experience
 
+    @staticmethod
+    def _validate_year_graduation(value):
+        """
+            Returns the year of graduation if it is between 1950 and 2030, otherwise None.
+        """
+        value = Person._as_int(value)
+        return value if value is not None and 1950 <= value <= 2030 else None
+
+    @staticmethod
+    def _validate_profession(value):
+        """
+            Returns the profession if it is one of the available professions, otherwise None.
+        """
+        return value if isinstance(value, str) and value in Employee.AVAILABLE_PROFESSIONS else None
+
+    @staticmethod
+    def _validate_work_experience(value):
+        """
+            Returns the years of work experience if they are between 0 and 60, otherwise None.
+        """
+        value = Person._as_int(value)
+        return value if value is not None and 0 <= value <= 60 else None
+
     @property
     def year_graduation(self):
         """
@@ -50,44 +88,21 @@ class Employee(Person):
         """
             Sets a year graduation.
         """
-        if isinstance(value, int) and 1950 <= value <= 2030:
-            self.__year_graduation = value
-        else:
-            self.__year_graduation = None
+        self.__year_graduation = Employee._validate_year_graduation(value)
 
     @profession.setter
     def profession(self, value):
         """
             Sets the profession of the employee, ensuring it is one of the available professions.
         """
-        if isinstance(value, str) and value in Employee.AVAILABLE_PROFESSIONS:
-            self.__profession = value
-        else:
-            self.__profession = None
+        self.__profession = Employee._validate_profession(value)
 
     @work_experience.setter
     def work_experience(self, value):
         """
             Sets the years of work experience, ensuring it is between 0 and 60.
         """
-        if isinstance(value, int) and 0 <= value <= 60:
-            self.__work_experience = value
-        else:
-            self.__work_experience = None
-
-    def __str__(self):
-        person_info = super().__str__()
-        foreign_language = f'Знание иностранного языка: {"да" if self.know_foreign_language == "True"
-        else "нет" if self.know_foreign_language == "False" else ""}\n'
-        education = f'Документ об образовании: {self.education_document}\n' if self.education_document else ''
-        graduation = f'Год окончания: {self.year_graduation}\n' if self.year_graduation else ''
-        qualification = f'Квалификация: {self.qualification}\n' if self.qualification else ''
-        specialty = f'Специальность: {self.specialty}\n' if self.specialty else ''
-        profession = f'Профессия: {self.profession}\n' if self.profession else ''
-        experience = f'Опыт работы: {self.work_experience}\n' if self.work_experience else ''
-
-        return ''.join(
-            [person_info, foreign_language, education, graduation, qualification, specialty, profession, experience])
+        self.__work_experience = Employee._validate_work_experience(value)
 
     def __repr__(self):
         return super().__repr__()
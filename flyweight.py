@@ -0,0 +1,62 @@
+import sys
+
+
+class BoundedTable(dict):
+    """
+        Table of pooled strings of one field that stops growing at `limit` values:
+        `table[value]` returns the pooled copy of the value, pooling it first while there is room.
+        Hits are plain dict lookups, only misses go through `__missing__`.
+    """
+
+    __slots__ = ('limit',)
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def __missing__(self, value):
+        if len(self) < self.limit:
+            self[value] = value
+        return value
+
+
+class FlyweightPool:
+    """
+        Shared tables of repeated string values, one per field, so every object loaded with
+        the same department, status or diagnosis references a single string instead of its own copy.
+        Every table keeps at most `limit` values, so a field with more distinct values than expected,
+        like a place of birth or work, pools its most frequent early values and cannot grow without bound.
+    """
+
+    LIMIT = 4096
+
+    def __init__(self, fields, limit=LIMIT):
+        self.fields = tuple(fields)
+        self.limit = limit
+        self.tables = {field: BoundedTable(limit) for field in self.fields}
+
+    def table(self, field):
+        """
+            Returns the table of the field, or None if the field is not pooled.
+        """
+        return self.tables.get(field)
+
+    def clear(self):
+        """
+            Forgets every pooled value, objects loaded before keep their strings.
+        """
+        for table in self.tables.values():
+            table.clear()
+
+    def stats(self):
+        """
+            Returns the number of distinct values and the bytes they take for every pooled field.
+        """
+        return {field: (len(table), sum(sys.getsizeof(value) for value in table))
+                for field, table in self.tables.items()}
+
+
+FLYWEIGHTS = FlyweightPool((
+    'medical_department', 'status', 'place_work_study', 'place_birth',
+    'clinical_diagnosis', 'chronic_diagnosis', 'specialty', 'qualification',
+))
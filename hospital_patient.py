@@ -1,10 +1,20 @@
 from patient import Patient
+from layout import line
 
 
 class HospitalPatient(Patient):
     """
         Class describes a hospital patient, inheriting from the Patient class, with additional medical details.
     """
+
+    __slots__ = ('medical_department', 'room_number', 'clinical_diagnosis')
+
+    LAYOUT = (
+        line('Медицинский отдел', 'medical_department'),
+        line('Номер палаты', 'room_number'),
+        line('Диагноз', 'clinical_diagnosis', 'Диагноз не выявлен'),
+    )
+
     def __init__(self, full_name, gender, birthday,
                  place_birth, married, passport,
                  residence_address, level_education, phone_number,
@@ -21,14 +31,5 @@ class HospitalPatient(Patient):
         self.room_number = room_number
         self.clinical_diagnosis = clinical_diagnosis
 
-    def __str__(self):
-        patient_info = super().__str__()
-        department = f'Медицинский отдел: {self.medical_department}\n' if self.medical_department else ''
-        room = f'Номер палаты: {self.room_number}\n' if self.room_number else ''
-        diagnosis = (f'Диагноз: {self.clinical_diagnosis}\n'
-                     if self.clinical_diagnosis and self.clinical_diagnosis != 'Диагноз не выявлен' else '')
-
-        return ''.join([patient_info, department, room, diagnosis])
-
     def __repr__(self):
         return super().__repr__()
@@ -0,0 +1,85 @@
+import os
+import threading
+import zlib
+
+
+class CounterAllocator:
+    """
+        Hands out consecutive numbers, safe to share between threads.
+    """
+
+    def __init__(self, start=1):
+        self._next = start
+        self._lock = threading.Lock()
+
+    def allocate(self, origin=None):
+        """
+            Returns the next number, the origin of the row is ignored.
+        """
+        with self._lock:
+            _id = self._next
+            self._next += 1
+        return _id
+
+    def reserve(self, size):
+        """
+            Reserves a block of consecutive numbers and returns its first number.
+        """
+        with self._lock:
+            start = self._next
+            self._next += size
+        return start
+
+    def block(self, size):
+        """
+            Reserves a block of `size` consecutive numbers and returns it as a `BlockAllocator`.
+        """
+        return BlockAllocator(self.reserve(size), size)
+
+
+class BlockAllocator:
+    """
+        Hands out the numbers of a block reserved in advance with `CounterAllocator.block`.
+        It only holds plain integers, so unlike the shared counter it can be sent to worker processes.
+    """
+
+    def __init__(self, start, size):
+        self.start = start
+        self.end = start + size
+        self._next = start
+
+    def allocate(self, origin=None):
+        """
+            Returns the next number of the block.
+        """
+        if self._next == self.end:
+            raise ValueError(f'Блок номеров {self.start}-{self.end - 1} исчерпан')
+        _id = self._next
+        self._next += 1
+        return _id
+
+
+class OffsetAllocator:
+    """
+        Derives the number from the file name and the byte offset of the row,
+        so the same row always gets the same number whatever the load order.
+        Persons created without a row (a direct constructor call) are numbered by the `fallback` counter,
+        their numbers are below 2**40 and can only clash with the rows of a file whose name hashes to 0.
+    """
+
+    OFFSET_BITS = 40
+
+    def __init__(self, fallback=None):
+        self.fallback = CounterAllocator() if fallback is None else fallback
+
+    def allocate(self, origin=None):
+        """
+            Returns the number of the row at the given (file, offset) origin,
+            or the next number of the fallback counter without an origin.
+        """
+        if origin is None:
+            return self.fallback.allocate()
+
+        file, offset = origin
+        file_key = zlib.crc32(os.fsencode(os.path.basename(file))) & 0xFFFFFF
+        return (file_key << OffsetAllocator.OFFSET_BITS) | offset
@@ -0,0 +1,473 @@
+import heapq
+from collections import Counter
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain
+from keys import normalize_name, tokenize
+
+
+class Between:
+    """
+        Predicate value matching keys between low and high inclusive, a missing bound leaves that side open.
+    """
+
+    def __init__(self, low=None, high=None):
+        self.low = low
+        self.high = high
+
+    def __contains__(self, value):
+        if value is None:
+            return False
+        return (self.low is None or self.low <= value) and (self.high is None or value <= self.high)
+
+    def __repr__(self):
+        return f'Between({self.low!r}, {self.high!r})'
+
+
+class HashIndex:
+    """
+        Index of registry objects by the normalized value of one of their fields.
+        Several objects may share a key, lookups return all of them.
+    """
+
+    def __init__(self, field, normalize):
+        self.field = field
+        self.normalize = normalize
+        self.buckets = {}
+
+    def key_of(self, obj):
+        """
+            Returns the key of an object, or None if it has no usable value.
+        """
+        return self.normalize(getattr(obj, self.field, None))
+
+    def add(self, obj):
+        """
+            Adds an object to the index.
+        """
+        key = self.key_of(obj)
+        if key is not None:
+            self.buckets.setdefault(key, []).append(obj)
+
+    def remove(self, obj):
+        """
+            Removes an object from the index.
+        """
+        key = self.key_of(obj)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return
+        bucket[:] = [item for item in bucket if item is not obj]
+        if not bucket:
+            del self.buckets[key]
+
+    def find(self, value):
+        """
+            Returns the objects whose key matches the normalized value.
+        """
+        return list(self.buckets.get(self.normalize(value), ()))
+
+    def estimate(self, field, value):
+        """
+            Returns how many objects have the same key as the value, or None if the index does not cover
+            the field or the value has no key (None or a value the normalization rejects).
+            The count may include objects whose raw value only matches after normalization.
+        """
+        if field != self.field or isinstance(value, Between):
+            return None
+        key = self.normalize(value)
+        return None if key is None else len(self.buckets.get(key, ()))
+
+    def select(self, field, value):
+        """
+            Returns the objects with the same key as the value, a superset of those with `field == value`.
+        """
+        return self.find(value)
+
+    def __len__(self):
+        return len(self.buckets)
+
+
+def _department_key(value):
+    """
+        Returns the department name in lower case with single spaces, or None if it is not a string.
+    """
+    return (' '.join(value.lower().split()) or None) if isinstance(value, str) else None
+
+
+def _room_key(value):
+    """
+        Returns the room number without surrounding whitespace, or None if it is not a string.
+    """
+    return (value.strip() or None) if isinstance(value, str) else None
+
+
+class OccupancyIndex:
+    """
+        Index of hospital patients by department and room with occupancy counters,
+        so room lists and per-department totals are read without a scan.
+    """
+
+    def __init__(self):
+        self.departments = {}
+        self.totals = {}
+
+    def add(self, obj):
+        """
+            Adds a patient to its department and room.
+        """
+        department = _department_key(getattr(obj, 'medical_department', None))
+        if department is None:
+            return
+        room = _room_key(getattr(obj, 'room_number', None))
+        self.departments.setdefault(department, {}).setdefault(room, []).append(obj)
+        self.totals[department] = self.totals.get(department, 0) + 1
+
+    def remove(self, obj):
+        """
+            Removes a patient from its department and room.
+        """
+        department = _department_key(getattr(obj, 'medical_department', None))
+        rooms = self.departments.get(department)
+        if rooms is None:
+            return
+        room = _room_key(getattr(obj, 'room_number', None))
+        patients = rooms.get(room, [])
+        kept = [patient for patient in patients if patient is not obj]
+        if len(kept) == len(patients):
+            return
+
+        if kept:
+            rooms[room] = kept
+        else:
+            del rooms[room]
+        self.totals[department] -= 1
+        if not rooms:
+            del self.departments[department]
+            del self.totals[department]
+
+    def patients(self, department, room):
+        """
+            Returns the patients in the specified room of the department.
+        """
+        return list(self.departments.get(_department_key(department), {}).get(_room_key(room), ()))
+
+    def rooms(self, department):
+        """
+            Returns the number of occupied beds in every room of the department.
+        """
+        return {room: len(patients) for room, patients in self.departments.get(_department_key(department), {}).items()}
+
+    def occupied(self, department):
+        """
+            Returns the number of occupied beds in the department.
+        """
+        return self.totals.get(_department_key(department), 0)
+
+    def estimate(self, field, value):
+        """
+            Returns how many patients are in the department, or None if the predicate is not on the department
+            or the value is not a department name.
+        """
+        if field != 'medical_department' or isinstance(value, Between) or _department_key(value) is None:
+            return None
+        return self.occupied(value)
+
+    def select(self, field, value):
+        """
+            Returns the patients of the department whatever the case and spacing of its name, room by room.
+        """
+        return [patient for patients in self.departments.get(_department_key(value), {}).values() for patient in patients]
+
+    def __len__(self):
+        return len(self.departments)
+
+
+class NGramIndex:
+    """
+        Trigram index of names for ranked fuzzy and prefix search.
+        Names are compared in lower case with ё and е treated as the same letter.
+        Only the normalized name is kept per object, its trigrams are recomputed when needed.
+    """
+
+    N = 3
+    COMMON_SHARE = 0.05
+    COMMON_MIN = 1000
+    CANDIDATES = 20
+
+    def __init__(self, field='full_name'):
+        self.field = field
+        self.postings = {}
+        self.names = {}
+
+    @staticmethod
+    def grams_of(name, closed=True):
+        """
+            Returns the set of trigrams of a normalized name padded with spaces,
+            without the trailing padding when `closed` is false.
+        """
+        n = NGramIndex.N
+        padded = ' ' * (n - 1) + name + (' ' if closed else '')
+        return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+    def add(self, obj):
+        """
+            Adds an object to the index.
+        """
+        name = normalize_name(getattr(obj, self.field, None))
+        if name is None:
+            return
+        self.names[obj] = name
+        postings = self.postings
+        for gram in NGramIndex.grams_of(name):
+            objects = postings.get(gram)
+            if objects is None:
+                postings[gram] = {obj}
+            else:
+                objects.add(obj)
+
+    def remove(self, obj):
+        """
+            Removes an object from the index.
+        """
+        name = self.names.pop(obj, None)
+        if name is None:
+            return
+        for gram in NGramIndex.grams_of(name):
+            objects = self.postings[gram]
+            objects.discard(obj)
+            if not objects:
+                del self.postings[gram]
+
+    def _postings_of(self, grams):
+        """
+            Returns the postings of the trigrams found in the index, the shortest first.
+        """
+        return sorted((self.postings[gram] for gram in grams if gram in self.postings), key=len)
+
+    def search(self, query, limit=10, min_score=0.1):
+        """
+            Returns up to `limit` (score, object) pairs ranked by the share of trigrams
+            the name has in common with the query.
+            Candidates are gathered from the rarer trigrams of the query only: trigrams found in more than
+            COMMON_SHARE of the names and in more than COMMON_MIN names (padding, common endings) are skipped
+            unless nothing rarer is shared, and only the candidates sharing the most rare trigrams are scored.
+        """
+        name = normalize_name(query)
+        if name is None:
+            return []
+        grams = NGramIndex.grams_of(name)
+        postings = self._postings_of(grams)
+        if not postings:
+            return []
+
+        cutoff = max(len(postings[0]), len(self.names) * self.COMMON_SHARE, self.COMMON_MIN)
+        common = Counter(chain.from_iterable(objects for objects in postings if len(objects) <= cutoff))
+
+        scored = []
+        for obj, _ in common.most_common(limit * self.CANDIDATES):
+            found = NGramIndex.grams_of(self.names[obj])
+            shared = len(grams & found)
+            score = shared / (len(grams) + len(found) - shared)
+            if score >= min_score:
+                scored.append((score, obj))
+        return heapq.nlargest(limit, scored, key=lambda pair: pair[0])
+
+    def prefix(self, query, limit=10):
+        """
+            Returns up to `limit` objects whose name starts with the query, in alphabetical order.
+            Postings are intersected from the shortest one.
+        """
+        name = normalize_name(query)
+        if name is None:
+            return []
+        grams = NGramIndex.grams_of(name, closed=False)
+        postings = self._postings_of(grams)
+        if len(postings) < len(grams):
+            return []
+
+        candidates = postings[0]
+        for objects in postings[1:]:
+            candidates = candidates & objects
+            if not candidates:
+                return []
+
+        found = [obj for obj in candidates if self.names[obj].startswith(name)]
+        return heapq.nsmallest(limit, found, key=self.names.__getitem__)
+
+    def __len__(self):
+        return len(self.names)
+
+
+class InvertedIndex:
+    """
+        Index of the words of free-text fields, answering term and multi-term queries
+        with exact or prefix word matches.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.postings = {}
+        self.vocabulary = []
+
+    def terms_of(self, obj):
+        """
+            Returns the set of words in the indexed fields of an object.
+        """
+        return {term for field in self.fields for term in tokenize(getattr(obj, field, None))}
+
+    def add(self, obj):
+        """
+            Adds an object to the postings of each of its words.
+        """
+        for term in self.terms_of(obj):
+            objects = self.postings.get(term)
+            if objects is None:
+                objects = self.postings[term] = {}
+                insort(self.vocabulary, term)
+            objects[obj] = None
+
+    def remove(self, obj):
+        """
+            Removes an object from the postings of each of its words.
+        """
+        for term in self.terms_of(obj):
+            objects = self.postings.get(term)
+            if objects is None:
+                continue
+            objects.pop(obj, None)
+            if not objects:
+                del self.postings[term]
+                del self.vocabulary[bisect_left(self.vocabulary, term)]
+
+    def matches(self, term, prefix=False):
+        """
+            Returns the objects containing the word, or any word starting with it when `prefix` is set.
+        """
+        if not prefix:
+            return dict(self.postings.get(term, {}))
+
+        found = {}
+        for i in range(bisect_left(self.vocabulary, term), len(self.vocabulary)):
+            word = self.vocabulary[i]
+            if not word.startswith(term):
+                break
+            found.update(self.postings[word])
+        return found
+
+    def find(self, query, match_all=True, prefix=False):
+        """
+            Returns the objects containing all the words of the query, or any of them
+            when `match_all` is false.
+        """
+        sets = [self.matches(term, prefix) for term in dict.fromkeys(tokenize(query))]
+        if not sets:
+            return []
+        if not match_all:
+            found = {}
+            for objects in sets:
+                found.update(objects)
+            return list(found)
+
+        sets.sort(key=len)
+        return [obj for obj in sets[0] if all(obj in objects for objects in sets[1:])]
+
+    def __len__(self):
+        return len(self.postings)
+
+
+class SortedIndex:
+    """
+        Index of objects sorted by a numeric key for range and top-k queries.
+        New objects are collected and merged into the sorted order on the next query,
+        so loading many objects costs a single sort.
+    """
+
+    def __init__(self, key, field=None):
+        self.key = key
+        self.field = field
+        self.keys = []
+        self.objects = []
+        self._pending = []
+
+    def add(self, obj):
+        """
+            Adds an object to the index if its key is known.
+        """
+        key = self.key(obj)
+        if key is not None:
+            self._pending.append((key, obj))
+
+    def remove(self, obj):
+        """
+            Removes an object from the index.
+        """
+        key = self.key(obj)
+        if key is None:
+            return
+        self._merge()
+        low, high = bisect_left(self.keys, key), bisect_right(self.keys, key)
+        for i in range(low, high):
+            if self.objects[i] is obj:
+                del self.keys[i]
+                del self.objects[i]
+                return
+
+    def _merge(self):
+        """
+            Merges the objects added since the last query into the sorted order.
+        """
+        if not self._pending:
+            return
+        merged = sorted(list(zip(self.keys, self.objects)) + self._pending, key=lambda pair: pair[0])
+        self.keys = [key for key, _ in merged]
+        self.objects = [obj for _, obj in merged]
+        self._pending = []
+
+    def range(self, low=None, high=None):
+        """
+            Returns the objects with a key between low and high inclusive, in key order.
+            A missing bound leaves that side open.
+        """
+        self._merge()
+        start = 0 if low is None else bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect_right(self.keys, high)
+        return self.objects[start:end]
+
+    def top(self, count):
+        """
+            Returns up to `count` objects with the largest keys, largest first.
+        """
+        self._merge()
+        return self.objects[:-count - 1:-1] if count > 0 else []
+
+    def _bounds(self, value):
+        """
+            Returns the (low, high) key bounds of an exact value or a Between predicate.
+        """
+        return (value.low, value.high) if isinstance(value, Between) else (value, value)
+
+    def estimate(self, field, value):
+        """
+            Returns how many objects have the field equal to the value or within a Between range,
+            or None if the index is not over that field or cannot compare the value with its keys
+            (objects without a key, matched by None, are not indexed).
+        """
+        if self.field is None or field != self.field or value is None:
+            return None
+        self._merge()
+        low, high = self._bounds(value)
+        try:
+            start = 0 if low is None else bisect_left(self.keys, low)
+            end = len(self.keys) if high is None else bisect_right(self.keys, high)
+        except TypeError:
+            return None
+        return max(0, end - start)
+
+    def select(self, field, value):
+        """
+            Returns the objects matching the predicate in key order.
+        """
+        return self.range(*self._bounds(value))
+
+    def __len__(self):
+        return len(self.keys) + len(self._pending)
@@ -0,0 +1,129 @@
+import re
+from datetime import date
+
+_NOT_DIGITS = re.compile(r'\D')
+_WORD = re.compile(r'\w+')
+_ISSUE_DATE = re.compile(r'\d{2}\.\d{2}\.\d{4}\s*$')
+_DIGIT_LOOKALIKES = str.maketrans('бОоOoЗзlI', '600003311')
+_WORD_DATE = re.compile(r'(\d{1,2})\s+([а-яё]+)\s+(\d{4})')
+_MONTHS = {month: number for number, month in enumerate(
+    ('января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
+     'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря'), start=1)}
+
+
+def normalize_passport(value):
+    """
+        Returns the passport with single spaces between its parts, or None if it is not a string.
+    """
+    return (' '.join(value.split()) or None) if isinstance(value, str) else None
+
+
+def passport_number(value):
+    """
+        Returns the ten digits of the passport series and number of raw, possibly dirty passport details,
+        reading letters that look like digits (б as 6, о as 0, з as 3) as those digits,
+        or None if there are not exactly ten of them.
+    """
+    if not isinstance(value, str):
+        return None
+    digits = _NOT_DIGITS.sub('', _ISSUE_DATE.sub('', value).translate(_DIGIT_LOOKALIKES))
+    return digits if len(digits) == 10 else None
+
+
+def birthday_ordinal(value):
+    """
+        Returns the ordinal of a raw birthday written as dd.mm.yyyy or as "12 июля 1994",
+        or None if it is neither.
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip().lower()
+    found = _WORD_DATE.fullmatch(value)
+    try:
+        if found is None:
+            return date(int(value[6:10]), int(value[3:5]), int(value[0:2])).toordinal() if len(value) == 10 else None
+        month = _MONTHS.get(found.group(2))
+        return None if month is None else date(int(found.group(3)), month, int(found.group(1))).toordinal()
+    except ValueError:
+        return None
+
+
+def normalize_phone(value):
+    """
+        Returns the digits of a Russian phone number in the 7XXXXXXXXXX form,
+        or None if it is not a string or has no digits.
+    """
+    if not isinstance(value, str):
+        return None
+    digits = _NOT_DIGITS.sub('', value)
+    if len(digits) == 11 and digits[0] == '8':
+        digits = '7' + digits[1:]
+    elif len(digits) == 10:
+        digits = '7' + digits
+    return digits or None
+
+
+def normalize_policy(value):
+    """
+        Returns the medical policy number without whitespace, or None if it is not a string.
+    """
+    return (''.join(value.split()) or None) if isinstance(value, str) else None
+
+
+def normalize_name(value):
+    """
+        Returns the name in lower case with ё replaced by е and single spaces, or None if it is not a string.
+    """
+    if not isinstance(value, str):
+        return None
+    return ' '.join(value.lower().replace('ё', 'е').split()) or None
+
+
+def tokenize(value):
+    """
+        Returns the words of a free-text value in lower case with ё replaced by е.
+    """
+    if not isinstance(value, str):
+        return []
+    return _WORD.findall(value.lower().replace('ё', 'е'))
+
+
+def work_experience(obj):
+    """
+        Returns the years of work experience of an employee.
+    """
+    return obj.work_experience
+
+
+def year_graduation(obj):
+    """
+        Returns the year of graduation of an employee.
+    """
+    return obj.year_graduation
+
+
+def birth_ordinal(obj):
+    """
+        Returns the birthday ordinal of a person.
+    """
+    return obj.birth_ordinal
+
+
+def birthday_of_year(obj):
+    """
+        Returns the birthday of a person as a month * 100 + day number, or None if it is unknown.
+    """
+    if obj.birth_ordinal is None:
+        return None
+    born = date.fromordinal(obj.birth_ordinal)
+    return born.month * 100 + born.day
+
+
+def years_before(day, years):
+    """
+        Returns the same calendar day the given number of years earlier, 29 February becomes 28 February.
+    """
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
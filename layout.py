@@ -0,0 +1,57 @@
+def line(label, field, skip=None):
+    """
+        Template of a line shown only when the field is set (and differs from `skip`).
+    """
+    condition = f'{{{field}}}' if skip is None else f'{{{field}}} and {{{field}}} != {skip!r}'
+    return f"(f'{label}: {{{{{{{field}}}}}}}\\n' if {condition} else '')"
+
+
+def yes_no(label, field):
+    """
+        Template of a line that is always shown: да for True, нет for False and empty otherwise.
+    """
+    return f"""f'{label}: {{{{"да" if {{{field}}} == True else "нет" if {{{field}}} == False else ""}}}}\\n'"""
+
+
+class Reads(dict):
+    """
+        Expressions reading the fields of the object `o` in a compiled layout, by field name.
+        Fields without an expression of their own are read as attributes, through their properties.
+    """
+
+    def __missing__(self, field):
+        return f'o.{field}'
+
+
+def layout_of(cls):
+    """
+        Returns the line templates of the class: the LAYOUT of every class along its MRO, base classes first.
+        Templates write fields as {field}, literal braces are doubled.
+    """
+    return [part for klass in reversed(cls.__mro__) for part in vars(klass).get('LAYOUT', ())]
+
+
+def compile_layout(cls, reads=None, name='text'):
+    """
+        Compiles the layout of the class into a function returning the text of an object,
+        reading every field with the expression `reads` gives for it.
+    """
+    reads = Reads() if reads is None else reads
+    parts = [part.format_map(reads) for part in layout_of(cls)]
+    source = f'def {name}(o):\n    return \'\'.join([\n        ' + ',\n        '.join(parts) + '])\n'
+    namespace = {}
+    exec(compile(source, f'<layout {cls.__name__}>', 'exec'), namespace)
+    return namespace[name]
+
+
+_texts = {}
+
+
+def text_of(obj):
+    """
+        Returns the text of an object built from the layout of its class, compiling the layout on first use.
+    """
+    text = _texts.get(type(obj))
+    if text is None:
+        text = _texts[type(obj)] = compile_layout(type(obj))
+    return text(obj)
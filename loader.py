@@ -1,88 +1,328 @@
-import inspect
+import heapq
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from hospital_patient import HospitalPatient
 from ambulatory_patient import AmbulatoryPatient
 from nurse import Nurse
 from doctor import Doctor
+from patient import Patient
+from decoder import RowDecoder
+from reader import MappedReader
+from table import PatientTable, StaffTable
+from parallel import load_parallel, timed_parse
+from tail import TailState
+from batch import iter_batches, validate_chunk
+from render import render_all
+from registry import Registry
+from rejects import RejectCollector
+from keys import normalize_name
 
 
 class Loader:
     """
         Class responsible for loading data from files and creating instances of different classes.
+        Every registry is an indexed `Registry`, the indexes named in `lazy` are built on their first use.
+        With a `SnapshotCache` given, the load_* methods reuse the snapshots of unchanged files.
+        Rows with the wrong amount of data are summed up in one report per load, and appended to the `quarantine` file if given.
     """
 
-    def __init__(self):
-        self.doctors = []
-        self.nurses = []
-        self.hospital_patients = []
-        self.ambulatory_patients = []
+    REGISTRIES = {
+        'hospital_patients': HospitalPatient,
+        'ambulatory_patients': AmbulatoryPatient,
+        'nurses': Nurse,
+        'doctors': Doctor,
+    }
 
-    def load_doctors(self, file):
+    def __init__(self, snapshots=None, quarantine=None, lazy=Registry.LAZY_INDEXES):
+        self.snapshots = snapshots
+        self.quarantine = quarantine
+        self.lazy = lazy
+        self.rejects = {}
+        self.tails = {}
+        self.doctors = Registry(cls=Doctor, lazy=lazy)
+        self.nurses = Registry(cls=Nurse, lazy=lazy)
+        self.hospital_patients = Registry(cls=HospitalPatient, lazy=lazy)
+        self.ambulatory_patients = Registry(cls=AmbulatoryPatient, lazy=lazy)
+
+    def load_doctors(self, file, workers=None):
         """
-            Loads doctor data from the specified file and stores it in the `doctors` list.
+            Loads doctor data from the specified file and stores it in the `doctors` registry.
+            Pass `workers` to parse the file in parallel.
         """
-        self.doctors = Loader.loader(file, Doctor)
+        self._load('doctors', file, workers)
 
-    def load_nurses(self, file):
+    def load_nurses(self, file, workers=None):
         """
-            Loads nurse data from the specified file and stores it in the `nurses` list.
+            Loads nurse data from the specified file and stores it in the `nurses` registry.
+            Pass `workers` to parse the file in parallel.
         """
-        self.nurses = Loader.loader(file, Nurse)
+        self._load('nurses', file, workers)
 
-    def load_hospital_patients(self, file):
+    def load_hospital_patients(self, file, workers=None):
         """
-            Loads hospital patient data from the specified file and stores it in the `hospital_patients` list.
+            Loads hospital patient data from the specified file and stores it in the `hospital_patients` registry.
+            Pass `workers` to parse the file in parallel.
         """
-        self.hospital_patients = Loader.loader(file, HospitalPatient)
+        self._load('hospital_patients', file, workers)
 
-    def load_ambulatory_patients(self, file):
+    def load_ambulatory_patients(self, file, workers=None):
+        """
+            Loads ambulatory patient data from the specified file and stores it in the `ambulatory_patients` registry.
+            Pass `workers` to parse the file in parallel.
         """
-            Loads ambulatory patient data from the specified file and stores it in the `ambulatory_patients` list.
+        self._load('ambulatory_patients', file, workers)
+
+    def load_all(self, paths, executor=None):
         """
-        self.ambulatory_patients = Loader.loader(file, AmbulatoryPatient)
+            Loads several registries at once, `paths` maps a registry name from `REGISTRIES` to its file.
+            The files are parsed concurrently on the executor (one thread per file by default), the objects
+            are numbered in the order of `paths`, like with one load_* call after another.
+            Every registry gets its own reject collector in `rejects`.
+            Returns the seconds spent on every file.
+        """
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=len(paths) or 1)
+
+        try:
+            stats = {name: Loader._stat(file) for name, file in paths.items()}
+            futures = {name: executor.submit(timed_parse, file, Loader.REGISTRIES[name], self.snapshots)
+                       for name, file in paths.items()}
+
+            timings = {}
+            for name, future in futures.items():
+                file = paths[name]
+                decoder = RowDecoder.for_class(Loader.REGISTRIES[name])
+
+                try:
+                    rows, rejected, seconds = future.result()
+                except FileNotFoundError:
+                    print(f"Ошибка: файл не найден.")
+                    rows, rejected, seconds = [], [], 0.0
+
+                start = time.perf_counter()
+                with RejectCollector(quarantine=self.quarantine) as rejects:
+                    rejects.add_rows(decoder.cls, file, rejected)
+                self.rejects[name] = rejects
+                setattr(self, name, Registry(decoder.build_rows(file, rows), decoder.cls, lazy=self.lazy))
+                self._remember_tail(name, file, stats[name])
+                timings[name] = seconds + time.perf_counter() - start
+
+            for name in futures:
+                self.rejects[name].print_report()
+            return timings
+
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+    def reload(self, name):
+        """
+            Appends to the registry `name` the rows added to its file since the last load or reload.
+            Only complete lines are consumed. If the file was truncated or rewritten, the registry
+            is loaded again from scratch. Returns the list of objects that entered the registry
+            and whether the registry was loaded again (then the list holds all of its objects).
+        """
+        state = self.tails.get(name)
+        try:
+            span = state.new_range() if state is not None else None
+        except FileNotFoundError:
+            span = None
+
+        if span is None:
+            if state is not None:
+                self._load(name, state.file)
+            return list(getattr(self, name)), True
+
+        start, end = span
+        decoder = RowDecoder.for_class(Loader.REGISTRIES[name])
+        rejected = []
+        added = [decoder.decode(args, (state.file, offset))
+                 for offset, args in MappedReader(state.file).iter_rows(decoder.cls, start=start, end=end,
+                                                                         rejected=rejected)]
+        with RejectCollector(quarantine=self.quarantine) as rejects:
+            rejects.add_rows(decoder.cls, state.file, rejected)
+        rejects.print_report()
+        self.rejects[name] = rejects
+        getattr(self, name).extend(added)
+        self.tails[name] = TailState.at(state.file, end)
+        return added, False
+
+    def registered(self, passport=None, medical_policy=None, prefilter=False):
+        """
+            Returns the (registry name, object) pairs of the people already registered with the passport
+            or the medical policy in any of the four registries, checking the Bloom filters first
+            when `prefilter` is set.
+        """
+        return [(name, obj) for name in Loader.REGISTRIES
+                for obj in getattr(self, name).registered(passport, medical_policy, prefilter)]
+
+    def admission_filter_stats(self):
+        """
+            Returns the keys, memory and false positive rates of the Bloom filter of every registry.
+        """
+        return {name: getattr(self, name).index('known_keys').stats() for name in Loader.REGISTRIES}
+
+    def search_names(self, query, limit=10):
+        """
+            Returns up to `limit` (score, object) pairs with the full names closest to the query
+            across all four registries.
+        """
+        found = [pair for name in Loader.REGISTRIES for pair in getattr(self, name).search_name(query, limit)]
+        return heapq.nlargest(limit, found, key=lambda pair: pair[0])
+
+    def prefix_names(self, query, limit=10):
+        """
+            Returns up to `limit` objects across all four registries whose full name starts with the query.
+        """
+        found = [obj for name in Loader.REGISTRIES
+                 for obj in getattr(self, name).index('full_name').prefix(query, limit)]
+        return heapq.nsmallest(limit, found, key=lambda obj: normalize_name(obj.full_name))
+
+    def with_allergy(self, substances, match_all=True):
+        """
+            Returns the hospital and ambulatory patients whose allergic reactions mention the substances.
+        """
+        return (self.hospital_patients.with_allergy(substances, match_all)
+                + self.ambulatory_patients.with_allergy(substances, match_all))
+
+    def _load(self, name, file, workers=None):
+        """
+            Loads the file into the registry `name`, through the snapshot cache if the loader has one,
+            remembers how far the file was consumed and prints the report of the rejected rows.
+        """
+        cls = Loader.REGISTRIES[name]
+        before = Loader._stat(file)
+        with RejectCollector(quarantine=self.quarantine) as rejects:
+            if self.snapshots is not None:
+                objects = self.snapshots.load(file, cls, workers, rejects)
+            else:
+                objects = Loader.loader(file, cls, workers, rejects)
+        setattr(self, name, Registry(objects, cls, lazy=self.lazy))
+        self._remember_tail(name, file, before)
+        self.rejects[name] = rejects
+        rejects.print_report()
+
+    def _remember_tail(self, name, file, before):
+        """
+            Remembers the consumed state of a fully loaded file, or forgets it if the file was missing.
+        """
+        state = TailState.capture(file, before) if before is not None else None
+        if state is None:
+            self.tails.pop(name, None)
+        else:
+            self.tails[name] = state
 
     @staticmethod
-    def loader(file, cls):
+    def _stat(file):
         """
-            A static method that loads data from a file and creates instances of the specified class.
+            Returns os.stat of the file or None if it does not exist.
         """
-        objects = []
         try:
-            with open(file, 'r', encoding='utf-8') as data:
-                for raw in data.readlines():
-                    args = raw.strip().split(';')
-                    if args[-1] == '':
-                        args = args[:-1]
+            return os.stat(file)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def iter_doctors(file):
+        """
+            Yields doctors from the specified file one at a time.
+        """
+        return Loader.iter_loader(file, Doctor)
 
-                    args = [True if arg.lower() == 'true' or arg.lower() == 'да' else False
-                    if arg.lower() == 'false' or arg.lower() == 'нет' else arg for arg in args]
+    @staticmethod
+    def iter_nurses(file):
+        """
+            Yields nurses from the specified file one at a time.
+        """
+        return Loader.iter_loader(file, Nurse)
 
-                    need_args = len(inspect.signature(cls.__init__).parameters) - 1
+    @staticmethod
+    def iter_hospital_patients(file):
+        """
+            Yields hospital patients from the specified file one at a time.
+        """
+        return Loader.iter_loader(file, HospitalPatient)
+
+    @staticmethod
+    def iter_ambulatory_patients(file):
+        """
+            Yields ambulatory patients from the specified file one at a time.
+        """
+        return Loader.iter_loader(file, AmbulatoryPatient)
 
-                    if len(args) != need_args:
-                        print(f"Ошибка: некорректное количество данных для {cls.__name__}: {len(args)}")
-                        continue
+    @staticmethod
+    def loader(file, cls, workers=None, rejects=None):
+        """
+            A static method that loads data from a file and creates instances of the specified class.
+            With `workers` set, the file is split into chunks parsed by that many processes,
+            otherwise the rows are validated column by column in batches.
+            Rejected rows go to the `rejects` collector, without one their summary is printed.
+        """
+        if workers:
+            return load_parallel(file, cls, workers, rejects)
+        decoder = RowDecoder.for_class(cls)
+        objects = []
+        for rows in iter_batches(Loader.iter_rows(file, cls, rejects=rejects)):
+            objects.extend(decoder.build_rows(file, validate_chunk(cls, rows)))
+        return objects
 
-                    patient = cls(*args)
-                    objects.append(patient)
+    @staticmethod
+    def iter_loader(file, cls, rejects=None):
+        """
+            A generator that reads the file line by line and yields instances of the specified class,
+            so only one row is held in memory at a time.
+        """
+        decoder = RowDecoder.for_class(cls)
+        for offset, args in Loader.iter_rows(file, cls, rejects=rejects):
+            yield decoder.decode(args, (file, offset))
 
-            return objects
+    @staticmethod
+    def iter_rows(file, cls, fields=None, rejects=None):
+        """
+            A generator that yields the byte offset and the split row of every line of the file
+            which has the right amount of data for the specified class.
+            With `fields` given, only those fields are decoded and yielded, in that order.
+            Other rows go to the `rejects` collector, without one their summary is printed when the generator
+            is exhausted or closed.
+        """
+        collector = RejectCollector() if rejects is None else rejects
+        rejected = []
+        try:
+            for row in MappedReader(file).iter_rows(cls, fields, rejected=rejected):
+                if rejected:
+                    collector.add_rows(cls, file, rejected)
+                    rejected.clear()
+                yield row
+            collector.add_rows(cls, file, rejected)
 
         except FileNotFoundError:
             print(f"Ошибка: файл не найден.")
-            return []
+
+        finally:
+            if rejects is None:
+                collector.print_report()
+
+    @staticmethod
+    def load_table(file, cls):
+        """
+            Loads the specified file straight into a columnar table without creating instances:
+            a `PatientTable` for patients and a `StaffTable` for employees.
+        """
+        table = PatientTable(cls) if issubclass(cls, Patient) else StaffTable(cls)
+        for rows in iter_batches(Loader.iter_rows(file, cls)):
+            table.append_rows(file, rows)
+        return table
 
     def print_doctors(self):
-        for doctor in self.doctors:
-            print(doctor)
+        render_all(self.doctors)
 
     def print_nurses(self):
-        for nurse in self.nurses:
-            print(nurse)
+        render_all(self.nurses)
 
     def print_hospital_patients(self):
-        for patient in self.hospital_patients:
-            print(patient)
+        render_all(self.hospital_patients)
 
     def print_ambulatory_patients(self):
-        for patient in self.ambulatory_patients:
-            print(patient)
+        render_all(self.ambulatory_patients)
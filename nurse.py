@@ -1,9 +1,19 @@
 from employee import Employee
+from layout import yes_no
 
 class Nurse(Employee):
     """
         Class representing a nurse, inheriting from the Employee class.
     """
+
+    __slots__ = ('sanitary_service', 'patient_care', 'medical_procedures')
+
+    LAYOUT = (
+        yes_no('Санитарная служба', 'sanitary_service'),
+        yes_no('Уход за пациентами', 'patient_care'),
+        yes_no('Медицинские процедуры', 'medical_procedures'),
+    )
+
     def __init__(self, full_name, gender, birthday, place_birth, married, passport,
                  residence_address, level_education, phone_number,
                  know_foreign_language, education_document, year_graduation, qualification,
@@ -13,20 +23,9 @@ class Nurse(Employee):
                          level_education, phone_number, know_foreign_language,
                          education_document, year_graduation, qualification,
                          specialty, profession, work_experience)
-        self.sanitary_service = sanitary_service if isinstance(sanitary_service, bool) else None
-        self.patient_care = patient_care if isinstance(patient_care, bool) else None
-        self.medical_procedures = medical_procedures if isinstance(medical_procedures, bool) else None
-
-    def __str__(self):
-        employee_info = super().__str__()
-        sanitary = f'Санитарная служба: {"да" if self.sanitary_service == True
-        else "нет" if self.sanitary_service == False else ""}\n'
-        care = f'Уход за пациентами: {"да" if self.patient_care == True
-        else "нет" if self.patient_care == False else ""}\n'
-        procedures = f'Медицинские процедуры: {"да" if self.medical_procedures == True
-        else "нет" if self.medical_procedures == False else ""}\n'
-
-        return ''.join([employee_info, sanitary, care, procedures])
+        self.sanitary_service = Employee._as_bool(sanitary_service)
+        self.patient_care = Employee._as_bool(patient_care)
+        self.medical_procedures = Employee._as_bool(medical_procedures)
 
     def __repr__(self):
         return super().__repr__()
@@ -0,0 +1,89 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from decoder import RowDecoder
+from reader import MappedReader
+from batch import validate_chunk
+from rejects import RejectCollector
+
+MIN_CHUNK_SIZE = 1 << 20
+
+
+def chunk_ranges(file, chunks):
+    """
+        Splits the file into at most the given number of byte ranges, each ending right after a newline.
+    """
+    size = os.path.getsize(file)
+    bounds = [0]
+    with open(file, 'rb') as data:
+        for i in range(1, chunks):
+            data.seek(max(size * i // chunks, bounds[-1]))
+            data.readline()
+            position = data.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def parse_chunk(file, start, end, cls):
+    """
+        Parses the rows of one byte range of the file and validates them column by column.
+        Returns the byte offset and validated values of every good row and the (offset, field count, line)
+        of the rejected ones, in file order.
+    """
+    rejected = []
+    rows = validate_chunk(cls, list(MappedReader(file).iter_rows(cls, start=start, end=end, rejected=rejected)))
+    return rows, rejected
+
+
+def parse_file(file, cls, workers=None):
+    """
+        Parses the whole file like `parse_chunk`, with `workers` set the newline-aligned chunks
+        are parsed by a pool of processes and merged back in file order.
+    """
+    size = os.path.getsize(file)
+    if not workers:
+        return parse_chunk(file, 0, size, cls)
+
+    ranges = chunk_ranges(file, max(1, min(workers * 4, size // MIN_CHUNK_SIZE)))
+    rows = []
+    rejected = []
+
+    with ProcessPoolExecutor(workers) as pool:
+        starts, ends = zip(*ranges)
+        for chunk_rows, chunk_rejected in pool.map(parse_chunk, repeat(file), starts, ends, repeat(cls)):
+            rows.extend(chunk_rows)
+            rejected.extend(chunk_rejected)
+
+    return rows, rejected
+
+
+def timed_parse(file, cls, cache=None):
+    """
+        Parses a whole file, through the snapshot cache if one is given,
+        and also returns the seconds it took.
+    """
+    start = time.perf_counter()
+    rows, rejected = cache.read_rows(file, cls) if cache is not None else parse_file(file, cls)
+    return rows, rejected, time.perf_counter() - start
+
+
+def load_parallel(file, cls, workers=None, rejects=None):
+    """
+        Loads the file with a pool of processes parsing newline-aligned chunks.
+        The objects are numbered here from the row origins in file order,
+        so they get the same numbers as with a sequential load.
+        Rejected rows go to the `rejects` collector, without one their summary is printed.
+    """
+    try:
+        rows, rejected = parse_file(file, cls, workers or os.cpu_count() or 1)
+    except FileNotFoundError:
+        print(f"Ошибка: файл не найден.")
+        return []
+
+    RejectCollector.route(rejects, cls, file, rejected)
+    return RowDecoder.for_class(cls).build_rows(file, rows)
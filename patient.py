@@ -1,4 +1,5 @@
 from person import Person
+from layout import line
 
 class Patient(Person):
     """
@@ -9,6 +10,18 @@ class Patient(Person):
     AVAILABLE_BLOOD_TYPES = ['1', '2', '3', '4']
     AVAILABLE_RHESUS_AFFILIATION = ['-', '+']
 
+    __slots__ = ('medical_policy', '__status', 'place_work_study', '__blood_type',
+                 '__rhesus_affiliation', 'allergic_reactions')
+
+    LAYOUT = (
+        line('Медицинский полис', 'medical_policy'),
+        line('Статус', 'status'),
+        line('Место работы', 'place_work_study'),
+        "(f'Группа крови: {{{blood_type}}} ({{{rhesus_affiliation}}})\\n' if {blood_type} and {rhesus_affiliation}"
+        " else f'Группа крови: {{{blood_type}}}\\n' if {blood_type} else '')",
+        line('Аллергические реакции', 'allergic_reactions'),
+    )
+
     def __init__(self, full_name, gender, birthday,
                  place_birth, married, passport,
                  residence_address, level_education, phone_number,
@@ -25,6 +38,27 @@ class Patient(Person):
         self.rhesus_affiliation = rhesus_affiliation
         self.allergic_reactions = allergic_reactions
 
+    @staticmethod
+    def _validate_status(value):
+        """
+            Returns the status if it is one of the available options, otherwise None.
+        """
+        return value if value in Patient.AVAILABLE_STATUS else None
+
+    @staticmethod
+    def _validate_blood_type(value):
+        """
+            Returns the blood type if it is one of the available types, otherwise None.
+        """
+        return value if value in Patient.AVAILABLE_BLOOD_TYPES else None
+
+    @staticmethod
+    def _validate_rhesus_affiliation(value):
+        """
+            Returns the rhesus affiliation if it is one of the available options, otherwise None.
+        """
+        return value if value in Patient.AVAILABLE_RHESUS_AFFILIATION else None
+
     @property
     def status(self):
         """
@@ -51,33 +85,21 @@ class Patient(Person):
         """
             Sets the patient's status, ensuring it's one of the available options.
         """
-        self.__status = value if value in Patient.AVAILABLE_STATUS else None
+        self.__status = Patient._validate_status(value)
 
     @blood_type.setter
     def blood_type(self, value):
         """
             Sets the patient's blood type, ensuring it's one of the available types.
         """
-        self.__blood_type = value if value in Patient.AVAILABLE_BLOOD_TYPES else None
+        self.__blood_type = Patient._validate_blood_type(value)
 
     @rhesus_affiliation.setter
     def rhesus_affiliation(self, value):
         """
             Sets the patient's rhesus affiliation, ensuring it's one of the available options.
         """
-        self.__rhesus_affiliation = value if value in Patient.AVAILABLE_RHESUS_AFFILIATION else None
-
-    def __str__(self):
-        person = super().__str__()
-        blood = (f'Группа крови: {self.blood_type} ({self.rhesus_affiliation})\n'
-                 if self.blood_type and self.rhesus_affiliation else
-                 f'Группа крови: {self.blood_type}\n' if self.blood_type else '')
-        status = f'Статус: {self.status}\n' if self.status else ''
-        policy = f'Медицинский полис: {self.medical_policy}\n' if self.medical_policy else ''
-        place = f'Место работы: {self.place_work_study}\n' if self.place_work_study else ''
-        react = f'Аллергические реакции: {self.allergic_reactions}\n' if self.allergic_reactions else ''
-
-        return ''.join([person, policy, status, place, blood, react])
+        self.__rhesus_affiliation = Patient._validate_rhesus_affiliation(value)
 
     def __repr__(self):
         return super().__repr__()
@@ -1,4 +1,27 @@
 import re
+from datetime import date
+from ids import CounterAllocator
+from layout import line, text_of
+
+
+def date_ordinal(value):
+    """
+        Returns the proleptic Gregorian ordinal of a dd.mm.yyyy date, or None if it is not a real date.
+    """
+    if not value:
+        return None
+    try:
+        return date(int(value[6:10]), int(value[3:5]), int(value[0:2])).toordinal()
+    except ValueError:
+        return None
+
+
+def passport_issue_ordinal(value):
+    """
+        Returns the ordinal of the issue date at the end of validated passport details, or None.
+    """
+    return date_ordinal(value[-10:]) if value else None
+
 
 class Person:
     """
@@ -8,23 +31,132 @@ class Person:
     VALID_GENDERS = ['муж.', 'жен.']
     VALID_EDUCATION = ['высшее', 'ср.спец', 'среднее']
 
+    __slots__ = ('__id', '__full_name', '__gender', '__birthday', '__birth_ordinal', 'place_birth', 'married',
+                 '__passport', '__passport_issue_ordinal', 'residence_address', '__level_education', '__phone_number')
+
+    # Lines of str(obj) this class adds to those of its base classes, compiled by layout.py.
+    LAYOUT = (
+        "f'Номер: {{{_Person__id}}}\\n'",
+        line('ФИО', 'full_name'),
+        line('Пол', 'gender'),
+        line('Дата рождения', 'birthday'),
+        line('Место рождения', 'place_birth'),
+        """f'В браке: {{"да" if {married} else "нет"}}\\n'""",
+        line('Паспорт', 'passport'),
+        line('Адрес регистрации', 'residence_address'),
+        line('Уровень образования', 'level_education'),
+        line('Телефон', 'phone_number'),
+    )
+
+    DERIVED_FIELDS = {
+        'birthday': ('birth_ordinal', date_ordinal),
+        'passport': ('passport_issue_ordinal', passport_issue_ordinal),
+    }
 
-    __id = 1
+    BIRTHDAY_PATTERN = re.compile(r'\d{2}\.\d{2}\.\d{4}')
+    PASSPORT_PATTERN = re.compile(r'^\d{4}\s\d{6}\s\d{2}\.\d{2}\.\d{4}$')
+    PHONE_PATTERN = re.compile(r'^\+7\(\d{3}\)\d{3}-\d{2}-\d{2}$')
+
+    id_allocator = CounterAllocator()
 
     def __init__(self, full_name, gender, birthday, place_birth, married, passport, residence_address, level_education, phone_number):
-        self.__id = Person.__id
-        Person.__id += 1
+        self.__id = Person._next_id()
 
         self.full_name = full_name
         self.gender = gender
         self.birthday = birthday
-        self.place_birth = place_birth if isinstance(place_birth, str) else None
-        self.married = married if isinstance(married, bool) else None
+        self.place_birth = Person._as_str(place_birth)
+        self.married = Person._as_bool(married)
         self.passport = passport
-        self.residence_address = residence_address if isinstance(residence_address, str) else None
+        self.residence_address = Person._as_str(residence_address)
         self.level_education = level_education
         self.phone_number = phone_number
 
+    @staticmethod
+    def _next_id(origin=None):
+        """
+            Returns the next person number from `Person.id_allocator`.
+            The origin is the (file, offset) of the row the person was read from, if known.
+        """
+        return Person.id_allocator.allocate(origin)
+
+    @staticmethod
+    def _row_allocator(size):
+        """
+            Returns the allocator numbering the next `size` rows of a load: one block reserved at once
+            when `Person.id_allocator` hands out blocks, otherwise the allocator itself.
+        """
+        block = getattr(Person.id_allocator, 'block', None)
+        return Person.id_allocator if block is None else block(size)
+
+    @staticmethod
+    def _as_str(value):
+        """
+            Returns the value if it is a string, otherwise None.
+        """
+        return value if isinstance(value, str) else None
+
+    @staticmethod
+    def _as_bool(value):
+        """
+            Returns the value if it is a boolean, otherwise None.
+        """
+        return value if isinstance(value, bool) else None
+
+    @staticmethod
+    def _as_int(value):
+        """
+            Returns the value as an integer if it is one or a string of decimal digits, otherwise None.
+            Booleans are not integers here.
+        """
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().isdecimal():
+            return int(value)
+        return None
+
+    @staticmethod
+    def _validate_full_name(value):
+        """
+            Returns a full name cut to 25 characters or None.
+        """
+        return value[:25] if isinstance(value, str) else None
+
+    @staticmethod
+    def _validate_gender(value):
+        """
+            Returns the gender if it is one of the valid options, otherwise None.
+        """
+        return value if isinstance(value, str) and value in Person.VALID_GENDERS else None
+
+    @staticmethod
+    def _validate_birthday(value):
+        """
+            Returns the birthday if it is a string in the correct format, otherwise None.
+        """
+        return value if isinstance(value, str) and Person.BIRTHDAY_PATTERN.fullmatch(value) else None
+
+    @staticmethod
+    def _validate_passport(value):
+        """
+            Returns the passport details if they are a string in the correct format, otherwise None.
+        """
+        return value if isinstance(value, str) and Person.PASSPORT_PATTERN.fullmatch(value) else None
+
+    @staticmethod
+    def _validate_level_education(value):
+        """
+            Returns the level of education if it is one of the valid options, otherwise None.
+        """
+        return value if isinstance(value, str) and value in Person.VALID_EDUCATION else None
+
+    @staticmethod
+    def _validate_phone_number(value):
+        """
+            Returns the phone number if the format is correct, otherwise None.
+        """
+        return value if isinstance(value, str) and Person.PHONE_PATTERN.fullmatch(value) else None
+
     @property
     def full_name(self):
         """
@@ -37,10 +169,7 @@ class Person:
         """
             Sets a full name of a person.
         """
-        if isinstance(value, str):
-            self.__full_name = value[:25]
-        else:
-            self.__full_name = None
+        self.__full_name = Person._validate_full_name(value)
 
     @property
     def gender(self):
@@ -54,10 +183,7 @@ class Person:
         """
             Sets a gender.
         """
-        if isinstance(value, str) and value in Person.VALID_GENDERS:
-            self.__gender = value
-        else:
-            self.__gender = None
+        self.__gender = Person._validate_gender(value)
 
     @property
     def birthday(self):
@@ -71,10 +197,15 @@ class Person:
         """
             Sets the birthday of the person if the format is correct.
         """
-        if re.fullmatch(r'\d{2}\.\d{2}\.\d{4}', value):
-            self.__birthday = value
-        else:
-            self.__birthday = None
+        self.__birthday = Person._validate_birthday(value)
+        self.__birth_ordinal = date_ordinal(self.__birthday)
+
+    @property
+    def birth_ordinal(self):
+        """
+            Returns the birthday as a date ordinal, or None if it is unknown.
+        """
+        return self.__birth_ordinal
 
     @property
     def passport(self):
@@ -88,10 +219,15 @@ class Person:
         """
             Sets the passport details of the person if the format is correct.
         """
-        if re.fullmatch(r'^\d{4}\s\d{6}\s\d{2}\.\d{2}\.\d{4}$', value):
-            self.__passport = value
-        else:
-            self.__passport = None
+        self.__passport = Person._validate_passport(value)
+        self.__passport_issue_ordinal = passport_issue_ordinal(self.__passport)
+
+    @property
+    def passport_issue_ordinal(self):
+        """
+            Returns the passport issue date as a date ordinal, or None if it is unknown.
+        """
+        return self.__passport_issue_ordinal
 
     @property
     def level_education(self):
@@ -105,10 +241,7 @@ class Person:
         """
             Returns the level of education options.
         """
-        if isinstance(value, str) and value in Person.VALID_EDUCATION:
-            self.__level_education = value
-        else:
-            self.__level_education = None
+        self.__level_education = Person._validate_level_education(value)
 
     @property
     def phone_number(self):
@@ -122,28 +255,13 @@ class Person:
         """
             Sets a phone number.
         """
-        if (isinstance(value, str)
-                and re.fullmatch(r'^\+7\(\d{3}\)\d{3}-\d{2}-\d{2}$', value)):
-            self.__phone_number = value
-        else:
-            self.__phone_number = None
+        self.__phone_number = Person._validate_phone_number(value)
 
     def __str__(self):
-        _id = f'Номер: {self.__id}\n'
-        name = f'ФИО: {self.full_name}\n' if self.full_name else ''
-        gender = f'Пол: {self.gender}\n' if self.gender else ''
-        birth = f'Дата рождения: {self.birthday}\n' if self.birthday else ''
-        place_birth = f'Место рождения: {self.place_birth}\n' if self.place_birth else ''
-        married = f'В браке: {"да" if self.married else "нет"}\n'
-        passport = f'Паспорт: {self.passport}\n' if self.passport else ''
-        residence_address = f'Адрес регистрации: {self.residence_address}\n' if self.residence_address else ''
-        education = f'Уровень образования: {self.level_education}\n' if self.level_education else ''
-        phone = f'Телефон: {self.phone_number}\n' if self.phone_number else ''
-
-        return ''.join([
-            _id, name, gender, birth, place_birth, married,
-            passport, residence_address, education, phone
-        ])
+        """
+            Returns the lines of the LAYOUT of every class of the person, base classes first.
+        """
+        return text_of(self)
 
     def __repr__(self):
         """
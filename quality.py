@@ -0,0 +1,128 @@
+import heapq
+from hospital_patient import HospitalPatient
+from ambulatory_patient import AmbulatoryPatient
+from nurse import Nurse
+from doctor import Doctor
+from decoder import RowDecoder
+from reader import MappedReader
+from rejects import RejectCollector
+
+
+class TopValues:
+    """
+        Approximate counter of the most frequent values in bounded memory (the Space-Saving algorithm):
+        at most `capacity` values are tracked, a new value replaces the least counted one and inherits
+        its count, so the counts of frequent values may be overestimated but they are never missed.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, value):
+        """
+            Counts one occurrence of a value.
+        """
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self.capacity:
+            counts[value] = 1
+        else:
+            victim = min(counts, key=counts.get)
+            counts[value] = counts.pop(victim) + 1
+
+    def top(self, count):
+        """
+            Returns up to `count` (value, count) pairs, most frequent first.
+        """
+        return heapq.nlargest(count, self.counts.items(), key=lambda pair: pair[1])
+
+
+class FieldProfile:
+    """
+        Quality counters of one field: rows with an empty value, rows whose value the validation
+        turned into None, and the most frequent of those rejected values.
+    """
+
+    def __init__(self, field, capacity=64):
+        self.field = field
+        self.empty = 0
+        self.invalid = 0
+        self.offenders = TopValues(capacity)
+
+    def add(self, raw, value):
+        """
+            Counts one raw value of the field and its validated value.
+        """
+        if value is not None:
+            return
+        if raw is None or raw == '':
+            self.empty += 1
+        else:
+            self.invalid += 1
+            self.offenders.add(raw)
+
+
+class QualityReport:
+    """
+        Result of profiling one registry file: the number of good and rejected rows
+        and a profile of every field.
+    """
+
+    def __init__(self, file, cls, capacity=64):
+        self.file = file
+        self.cls = cls
+        self.rows = 0
+        self.rejects = RejectCollector()
+        self.fields = {field: FieldProfile(field, capacity) for field in RowDecoder.for_class(cls).fields}
+
+    def text(self, top=3):
+        """
+            Returns the report as a table with the fields that have empty or invalid values.
+        """
+        lines = [f'Качество данных {self.file} ({self.cls.__name__}): строк {self.rows}, '
+                 f'отклонено {self.rejects.total()}',
+                 f'  {"поле":<24} {"пусто":>7} {"неверно":>8}  частые неверные значения']
+        for profile in self.fields.values():
+            if not profile.empty and not profile.invalid:
+                continue
+            offenders = ', '.join(f'{value!r} ×{count}' for value, count in profile.offenders.top(top))
+            lines.append(f'  {profile.field:<24} {profile.empty:>7} {profile.invalid:>8}  {offenders}')
+        return '\n'.join(lines)
+
+
+def profile_file(file, cls, capacity=64):
+    """
+        Profiles a registry file in one streaming pass: every row is split and validated field by field
+        without creating objects, memory stays bounded by the number of fields and `capacity`.
+        A value its check fails on is counted as invalid, the profiling never stops on a bad value.
+    """
+    report = QualityReport(file, cls, capacity)
+    decoder = RowDecoder.for_class(cls)
+    checks = list(zip(decoder.validators, report.fields.values()))
+    rejected = []
+
+    for offset, args in MappedReader(file).iter_rows(cls, rejected=rejected):
+        if rejected:
+            report.rejects.add_rows(cls, file, rejected)
+            rejected.clear()
+        report.rows += 1
+        for (check, profile), raw in zip(checks, args):
+            try:
+                value = check(raw)
+            except (TypeError, ValueError):
+                value = None
+            if value is None:
+                profile.add(raw, value)
+    report.rejects.add_rows(cls, file, rejected)
+    return report
+
+
+if __name__ == '__main__':
+    for path, registry_class in (('hospital.txt', HospitalPatient), ('ambulatory.txt', AmbulatoryPatient),
+                                 ('nurses.txt', Nurse), ('doctors.txt', Doctor)):
+        try:
+            print(profile_file(path, registry_class).text())
+        except FileNotFoundError:
+            print(f"Ошибка: файл не найден.")
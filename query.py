@@ -0,0 +1,106 @@
+from indexes import Between
+
+
+class Query:
+    """
+        Conjunction of field predicates over a registry. A predicate value is either compared
+        for exact equality or is a Between range. Indexes only narrow the candidates, starting with
+        the most selective one and intersecting the rest, then every predicate is checked on the
+        candidates, so the result does not depend on the plan (indexes match normalized keys).
+    """
+
+    def __init__(self, registry, predicates):
+        self.registry = registry
+        self.predicates = dict(predicates)
+
+    def where(self, **predicates):
+        """
+            Returns a new query with the additional predicates.
+        """
+        return Query(self.registry, {**self.predicates, **predicates})
+
+    def plan(self):
+        """
+            Returns the indexed (estimate, field, value, name, index) steps, most selective first,
+            and the (field, value) predicates left for the scan.
+        """
+        indexed = []
+        scanned = []
+        for field, value in self.predicates.items():
+            best = None
+            for name, index in self.registry.indexes.items():
+                estimate = getattr(index, 'estimate', None)
+                count = None if estimate is None else estimate(field, value)
+                if count is not None and (best is None or count < best[0]):
+                    best = (count, field, value, name, index)
+            if best is None:
+                scanned.append((field, value))
+            else:
+                indexed.append(best)
+        indexed.sort(key=lambda step: step[0])
+        return indexed, scanned
+
+    @staticmethod
+    def matches(obj, field, value):
+        """
+            Checks one predicate against an object.
+        """
+        current = getattr(obj, field, None)
+        return current in value if isinstance(value, Between) else current == value
+
+    def all(self):
+        """
+            Returns the matching objects, in the order of the driving index or of the registry.
+        """
+        indexed, _ = self.plan()
+        if indexed:
+            _, field, value, _, index = indexed[0]
+            candidates = index.select(field, value)
+            for _, field, value, _, index in indexed[1:]:
+                if not candidates:
+                    break
+                allowed = set(index.select(field, value))
+                candidates = [obj for obj in candidates if obj in allowed]
+        else:
+            candidates = self.registry.items
+
+        predicates = self.predicates.items()
+        return [obj for obj in candidates if all(Query.matches(obj, field, value) for field, value in predicates)]
+
+    def first(self):
+        """
+            Returns the first matching object, or None if there is none.
+        """
+        found = self.all()
+        return found[0] if found else None
+
+    def count(self):
+        """
+            Returns the number of matching objects.
+        """
+        return len(self.all())
+
+    def explain(self):
+        """
+            Returns the plan of the query as text, one step per line.
+        """
+        indexed, _ = self.plan()
+        lines = []
+        for i, (count, field, value, name, index) in enumerate(indexed):
+            step = 'индекс' if i == 0 else 'пересечение с индексом'
+            lines.append(f'{step} {name} ({type(index).__name__}) по {field}={value!r}: ~{count}')
+        if self.predicates:
+            predicates = ', '.join(f'{field}={value!r}' for field, value in self.predicates.items())
+            if indexed:
+                lines.append(f'проверка кандидатов по {predicates}')
+            else:
+                lines.append(f'полный перебор {len(self.registry)} объектов по {predicates}')
+        if not lines:
+            lines.append(f'все {len(self.registry)} объектов')
+        return '\n'.join(lines)
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def __len__(self):
+        return self.count()
@@ -0,0 +1,114 @@
+import mmap
+import os
+from decoder import RowDecoder, BOOL_TOKENS
+
+BYTE_TOKENS = {word.encode('utf-8'): value for word, value in BOOL_TOKENS.items()}
+
+# Characters that str.strip() removes but bytes.strip() keeps: ASCII separators and non-ASCII spaces
+# (all of them are below U+3001), with the first and the last byte of their UTF-8 encoding.
+_TEXT_SPACES = [chr(code) for code in range(0x80, 0x3001) if chr(code).isspace()]
+_SEPARATORS = frozenset(range(0x1c, 0x20))
+_HEAD_BYTES = _SEPARATORS | {space.encode('utf-8')[0] for space in _TEXT_SPACES}
+_TAIL_BYTES = _SEPARATORS | {space.encode('utf-8')[-1] for space in _TEXT_SPACES}
+
+
+def _has_text_edge(line):
+    """
+        Checks whether a line stripped as bytes starts or ends with a character str.strip() would still remove.
+        Only lines whose edge bytes may belong to such a character decode their first or last code point.
+    """
+    first, last = line[0], line[-1]
+    if first in _HEAD_BYTES and (first in _SEPARATORS or line[:4].decode('utf-8', 'ignore')[:1].isspace()):
+        return True
+    return last in _TAIL_BYTES and (last in _SEPARATORS or line[-4:].decode('utf-8', 'ignore')[-1:].isspace())
+
+
+class MappedReader:
+    """
+        Reads a registry file through mmap in blocks of whole lines, so repeated loads of the same file
+        are served from the OS page cache. Whole rows are decoded a block at a time like in a text-mode file,
+        rows read for a few fields are split on raw bytes and only those fields are decoded.
+    """
+
+    BLOCK_SIZE = 1 << 20
+
+    def __init__(self, file):
+        self.file = file
+
+    def iter_blocks(self, start=0, end=None):
+        """
+            Yields (offset, block) pairs of the mapped file between the given byte offsets,
+            every block but the last one ends with a newline. A line starting before `end` is read to its end.
+        """
+        with open(self.file, 'rb') as data:
+            size = os.fstat(data.fileno()).st_size
+            end = size if end is None else min(end, size)
+            if start >= end:
+                return
+
+            with mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if end < size and view[end - 1] != 0x0a:
+                    end = view.find(b'\n', end) + 1 or size
+                position = start
+                while position < end:
+                    stop = min(position + MappedReader.BLOCK_SIZE, end)
+                    if stop < end:
+                        cut = view.rfind(b'\n', position, stop)
+                        stop = cut + 1 if cut >= 0 else view.find(b'\n', stop, end) + 1 or end
+                    yield position, view[position:stop]
+                    position = stop
+
+    def iter_rows(self, cls, fields=None, start=0, end=None, rejected=None):
+        """
+            Yields the byte offset and the values of every row with the right amount of data for cls.
+            Only the requested fields (all constructor fields by default) are decoded, in that order.
+            The (offset, field count, line) of every other row is appended to `rejected` if given.
+        """
+        decoder = RowDecoder.for_class(cls)
+        arity = decoder.arity
+        split = decoder.split
+        picked = None if fields is None else [decoder.fields.index(field) for field in fields]
+        tokens = BYTE_TOKENS
+
+        for offset, block in self.iter_blocks(start, end):
+            if picked is None and b'\r' not in block:
+                texts = block.decode('utf-8').split('\n')
+                if not texts[-1]:
+                    texts.pop()
+                find = block.find
+                position = 0
+                for text in texts:
+                    args = split(text)
+                    if len(args) == arity:
+                        yield offset + position, args
+                    elif rejected is not None:
+                        rejected.append((offset + position, len(args), text.strip()))
+                    position = find(b'\n', position) + 1
+                continue
+
+            for raw_line in block.splitlines(True):
+                line_offset, offset = offset, offset + len(raw_line)
+                line = raw_line.strip()
+                if picked is None or line and _has_text_edge(line):
+                    args = split(line.decode('utf-8'))
+                    if len(args) == arity:
+                        yield line_offset, args if picked is None else [args[i] for i in picked]
+                        continue
+                    raw = args
+                else:
+                    raw = line.split(b';')
+                    if raw[-1] == b'':
+                        raw.pop()
+
+                    if len(raw) == arity:
+                        if picked is not None:
+                            raw = [raw[i] for i in picked]
+                        args = []
+                        for field in raw:
+                            value = tokens.get(field)
+                            args.append(field.decode('utf-8') if value is None else value)
+                        yield line_offset, args
+                        continue
+
+                if rejected is not None:
+                    rejected.append((line_offset, len(raw), line.decode('utf-8', 'replace').strip()))
@@ -0,0 +1,277 @@
+from patient import Patient
+from hospital_patient import HospitalPatient
+from ambulatory_patient import AmbulatoryPatient
+from employee import Employee
+from doctor import Doctor
+from datetime import date, timedelta
+from query import Query
+from aggregates import GroupCount, AgeHistogram
+from bloom import KeyFilter
+from indexes import HashIndex, OccupancyIndex, NGramIndex, InvertedIndex, SortedIndex
+from keys import (normalize_passport, normalize_phone, normalize_policy, normalize_name,
+                  birth_ordinal, birthday_of_year, years_before, work_experience, year_graduation)
+
+
+class Registry:
+    """
+        List of registry objects that keeps its indexes and aggregates up to date on every append and removal.
+        The indexes named in `lazy` (the costly ones the query planner does not use, by default) are only
+        built from all the objects on their first use through `index`, the others are kept up to date from the start.
+    """
+
+    LAZY_INDEXES = ('known_keys', 'full_name', 'birthday_of_year', 'allergies', 'diagnoses')
+
+    def __init__(self, items=(), cls=None, indexes=None, aggregates=None, lazy=LAZY_INDEXES):
+        self.cls = cls
+        self.items = []
+        indexes = Registry.default_indexes(cls) if indexes is None else dict(indexes)
+        self.indexes = {name: index for name, index in indexes.items() if name not in lazy}
+        self.lazy_indexes = {name: index for name, index in indexes.items() if name in lazy}
+        self.aggregates = Registry.default_aggregates(cls) if aggregates is None else dict(aggregates)
+        self.extend(items)
+
+    def index(self, name):
+        """
+            Returns the named index, building a lazy one from all the objects on first use.
+        """
+        index = self.indexes.get(name)
+        if index is None:
+            index = self.indexes[name] = self.lazy_indexes.pop(name)
+            for obj in self.items:
+                index.add(obj)
+        return index
+
+    @staticmethod
+    def default_indexes(cls=None):
+        """
+            Returns new hash indexes by passport, phone number and medical policy with an optional Bloom filter
+            in front of them, a trigram index of full names, sorted indexes of birthdays, plus the indexes
+            specific to the class of the registry objects.
+        """
+        indexes = {
+            'passport': HashIndex('passport', normalize_passport),
+            'phone_number': HashIndex('phone_number', normalize_phone),
+            'medical_policy': HashIndex('medical_policy', normalize_policy),
+            'known_keys': KeyFilter(),
+            'full_name': NGramIndex('full_name'),
+            'birthday': SortedIndex(birth_ordinal, 'birth_ordinal'),
+            'birthday_of_year': SortedIndex(birthday_of_year),
+        }
+        if cls is not None and issubclass(cls, Patient):
+            indexes['allergies'] = InvertedIndex(('allergic_reactions',))
+            indexes['diagnoses'] = InvertedIndex(('clinical_diagnosis', 'chronic_diagnosis'))
+        if cls is not None and issubclass(cls, HospitalPatient):
+            indexes['occupancy'] = OccupancyIndex()
+        if cls is not None and issubclass(cls, Employee):
+            indexes['work_experience'] = SortedIndex(work_experience, 'work_experience')
+            indexes['year_graduation'] = SortedIndex(year_graduation, 'year_graduation')
+        if cls is not None and issubclass(cls, Doctor):
+            indexes['category'] = HashIndex('category', normalize_name)
+        return indexes
+
+    @staticmethod
+    def default_aggregates(cls=None):
+        """
+            Returns new aggregates: an age histogram for everyone plus the group counts
+            specific to the class of the registry objects.
+        """
+        aggregates = {'age': AgeHistogram()}
+        if cls is not None and issubclass(cls, Patient):
+            aggregates['blood_group'] = GroupCount(('blood_type', 'rhesus_affiliation'))
+        if cls is not None and issubclass(cls, HospitalPatient):
+            aggregates['medical_department'] = GroupCount('medical_department', normalize_name)
+        if cls is not None and issubclass(cls, AmbulatoryPatient):
+            aggregates['health_group'] = GroupCount('health_group')
+            aggregates['disability'] = GroupCount('disability')
+            aggregates['territorial_number'] = GroupCount('territorial_number')
+        if cls is not None and issubclass(cls, Employee):
+            aggregates['profession'] = GroupCount('profession')
+        return aggregates
+
+    def append(self, obj):
+        """
+            Appends an object and adds it to every index and aggregate.
+        """
+        self.items.append(obj)
+        for index in self.indexes.values():
+            index.add(obj)
+        for aggregate in self.aggregates.values():
+            aggregate.add(obj)
+
+    def extend(self, objects):
+        """
+            Appends several objects, adding all of them to one index or aggregate after another.
+        """
+        objects = list(objects)
+        self.items.extend(objects)
+        for index in list(self.indexes.values()) + list(self.aggregates.values()):
+            add = index.add
+            for obj in objects:
+                add(obj)
+
+    def remove(self, obj):
+        """
+            Removes an object from the registry and from every index and aggregate.
+        """
+        kept = [item for item in self.items if item is not obj]
+        if len(kept) == len(self.items):
+            return
+        self.items[:] = kept
+        for index in self.indexes.values():
+            index.remove(obj)
+        for aggregate in self.aggregates.values():
+            aggregate.remove(obj)
+
+    def where(self, **predicates):
+        """
+            Returns a query of the objects whose fields match all the predicates, e.g.
+            `where(medical_department='Кардиология', work_experience=Between(5, None))`.
+        """
+        return Query(self, predicates)
+
+    def by_passport(self, passport):
+        """
+            Returns the objects with the specified passport.
+        """
+        return self.index('passport').find(passport)
+
+    def by_phone(self, phone_number):
+        """
+            Returns the objects with the specified phone number.
+        """
+        return self.index('phone_number').find(phone_number)
+
+    def by_policy(self, medical_policy):
+        """
+            Returns the objects with the specified medical policy.
+        """
+        return self.index('medical_policy').find(medical_policy)
+
+    def registered(self, passport=None, medical_policy=None, prefilter=False):
+        """
+            Returns the objects with the passport or the medical policy. With `prefilter` set, keys the Bloom filter
+            has never seen are answered without a lookup in the exact indexes; the filter check costs more than
+            that dict lookup, so by default the exact indexes are asked directly.
+        """
+        found = {}
+        known = self.index('known_keys') if prefilter else None
+        for field, value in (('passport', passport), ('medical_policy', medical_policy)):
+            if value is None or known is not None and not known.might_contain(field, value):
+                continue
+            objects = self.index(field).find(value)
+            if not objects and known is not None:
+                known.record_miss()
+            found.update(dict.fromkeys(objects))
+        return list(found)
+
+    def search_name(self, query, limit=10):
+        """
+            Returns up to `limit` (score, object) pairs with the full names closest to the query.
+        """
+        return self.index('full_name').search(query, limit)
+
+    def born_between(self, first, last):
+        """
+            Returns the people born between the two dates inclusive, oldest first.
+        """
+        return self.index('birthday').range(first.toordinal(), last.toordinal())
+
+    def aged(self, youngest, oldest, on=None):
+        """
+            Returns the people whose full age in years is between youngest and oldest inclusive
+            on the given day (today by default).
+        """
+        on = on or date.today()
+        first = years_before(on, oldest + 1) + timedelta(days=1)
+        return self.born_between(first, years_before(on, youngest))
+
+    def birthdays_between(self, first, last):
+        """
+            Returns the people whose birthday falls between the two calendar days inclusive,
+            in calendar order. The window may wrap over the new year.
+        """
+        index = self.index('birthday_of_year')
+        start, end = first.month * 100 + first.day, last.month * 100 + last.day
+        if start <= end:
+            return index.range(start, end)
+        return index.range(start, None) + index.range(None, end)
+
+    def by_experience(self, low=None, high=None):
+        """
+            Returns the employees with work experience between low and high years inclusive,
+            least experienced first.
+        """
+        return self.index('work_experience').range(low, high)
+
+    def most_experienced(self, count):
+        """
+            Returns up to `count` employees with the longest work experience, longest first.
+        """
+        return self.index('work_experience').top(count)
+
+    def graduated_between(self, first, last):
+        """
+            Returns the employees who graduated between the two years inclusive, earliest first.
+        """
+        return self.index('year_graduation').range(first, last)
+
+    def by_category(self, category, first_year=None, last_year=None):
+        """
+            Returns the doctors of the category, optionally only those who graduated
+            between the two years inclusive.
+        """
+        doctors = self.index('category').find(category)
+        if first_year is None and last_year is None:
+            return doctors
+        graduated = set(self.index('year_graduation').range(first_year, last_year))
+        return [doctor for doctor in doctors if doctor in graduated]
+
+    def with_allergy(self, substances, match_all=True):
+        """
+            Returns the patients whose allergic reactions mention the substances,
+            a word of the query also matches longer words starting with it.
+        """
+        return self.index('allergies').find(substances, match_all, prefix=True)
+
+    def with_diagnosis(self, terms, match_all=True):
+        """
+            Returns the patients whose clinical or chronic diagnosis contains the terms.
+        """
+        return self.index('diagnoses').find(terms, match_all)
+
+    def in_room(self, department, room):
+        """
+            Returns the hospital patients in the specified room of the department.
+        """
+        return self.index('occupancy').patients(department, room)
+
+    def occupancy(self):
+        """
+            Returns the number of occupied beds per department.
+        """
+        return dict(self.index('occupancy').totals)
+
+    def count_by(self, aggregate, *values):
+        """
+            Returns the number of objects in one group of the named aggregate,
+            e.g. `count_by('blood_group', '2', '-')` or `count_by('age', 42)`.
+        """
+        return self.aggregates[aggregate].count(*values)
+
+    def counts(self, aggregate):
+        """
+            Returns a copy of all the group counts of the named aggregate.
+        """
+        return dict(self.aggregates[aggregate].counts)
+
+    def __getitem__(self, item):
+        return self.items[item]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return repr(self.items)
@@ -0,0 +1,101 @@
+class RejectCollector:
+    """
+        Collects the rows rejected during loads instead of printing every one of them:
+        counts them by class and reason, keeps the first `sample_size` of them and, with `quarantine` given,
+        appends their raw lines to that file through one buffered writer.
+    """
+
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, sample_size=5, quarantine=None):
+        self.sample_size = sample_size
+        self.quarantine = quarantine
+        self.counts = {}
+        self.sample = []
+        self._out = None
+
+    @staticmethod
+    def arity_reason(count):
+        """
+            Returns the reason of a row rejected for the wrong amount of data.
+        """
+        return f'некорректное количество данных: {count}'
+
+    def add(self, cls, file, offset, reason, line):
+        """
+            Records one rejected row: the class it was loaded as, its file and byte offset,
+            the reason and the raw line.
+        """
+        key = (cls.__name__, reason)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if len(self.sample) < self.sample_size:
+            self.sample.append((cls.__name__, file, offset, reason, line))
+        if self.quarantine is not None:
+            if self._out is None:
+                self._out = open(self.quarantine, 'a', encoding='utf-8', buffering=RejectCollector.BUFFER_SIZE)
+            self._out.write(line + '\n')
+
+    def add_rows(self, cls, file, rejected):
+        """
+            Records the (offset, field count, line) rows rejected for their amount of data.
+        """
+        for offset, count, line in rejected:
+            self.add(cls, file, offset, RejectCollector.arity_reason(count), line)
+
+    @staticmethod
+    def route(rejects, cls, file, rejected):
+        """
+            Adds the (offset, field count, line) rejected rows of a file to the collector,
+            or prints their summary right away when there is no collector.
+        """
+        if rejects is None:
+            rejects = RejectCollector()
+            rejects.add_rows(cls, file, rejected)
+            rejects.print_report()
+        else:
+            rejects.add_rows(cls, file, rejected)
+
+    def total(self):
+        """
+            Returns the number of rejected rows.
+        """
+        return sum(self.counts.values())
+
+    def report(self):
+        """
+            Returns the summary of the rejected rows as text, or an empty string if there were none.
+        """
+        if not self.counts:
+            return ''
+        lines = [f'Ошибка: отклонено строк: {self.total()}']
+        for (name, reason), count in sorted(self.counts.items()):
+            lines.append(f'  {name}, {reason}: {count}')
+        if self.sample:
+            lines.append('Примеры:')
+            for name, file, offset, reason, line in self.sample:
+                lines.append(f'  {file}:{offset}: {line}')
+        if self.quarantine is not None:
+            lines.append(f'Отклонённые строки записаны в {self.quarantine}')
+        return '\n'.join(lines)
+
+    def print_report(self):
+        """
+            Prints the summary of the rejected rows if there were any.
+        """
+        report = self.report()
+        if report:
+            print(report)
+
+    def close(self):
+        """
+            Flushes and closes the quarantine file.
+        """
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,59 @@
+import sys
+from person import Person
+from decoder import RowDecoder
+from layout import Reads, compile_layout
+
+FLUSH_EVERY = 1024
+
+_renderers = {}
+
+
+def compile_template(cls):
+    """
+        Compiles the layout of cls into one function returning the same text as str(obj),
+        reading the slots directly instead of going through the properties.
+        Classes with a __str__ of their own are rendered with str().
+    """
+    if cls.__str__ is not Person.__str__:
+        return str
+    decoder = RowDecoder.for_class(cls)
+    reads = Reads({field: f'o.{key}' for field, key in zip(decoder.fields, decoder.keys)})
+    return compile_layout(cls, reads, 'render')
+
+
+def renderer_of(cls):
+    """
+        Returns the compiled template of the class, compiling it on first use.
+    """
+    render = _renderers.get(cls)
+    if render is None:
+        render = _renderers[cls] = compile_template(cls)
+    return render
+
+
+def render_all(objects, out=None):
+    """
+        Writes the text of every object followed by an empty line, like print(obj) does,
+        joining the records into one write per `FLUSH_EVERY` objects (to stdout by default).
+    """
+    out = sys.stdout if out is None else out
+    chunk = []
+    cls = render = None
+    for obj in objects:
+        if type(obj) is not cls:
+            cls = type(obj)
+            render = renderer_of(cls)
+        chunk.append(render(obj))
+        if len(chunk) == FLUSH_EVERY:
+            out.write('\n'.join(chunk) + '\n')
+            chunk = []
+    if chunk:
+        out.write('\n'.join(chunk) + '\n')
+
+
+def export(objects, path):
+    """
+        Writes the text of the objects to a file through a large write buffer.
+    """
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as out:
+        render_all(objects, out)
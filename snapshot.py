@@ -0,0 +1,106 @@
+import hashlib
+import marshal
+import os
+import tempfile
+from decoder import RowDecoder
+from parallel import parse_file
+from rejects import RejectCollector
+
+# Snapshots hold already validated values: bump the version whenever validation changes.
+SNAPSHOT_VERSION = 5
+
+
+def file_digest(file):
+    """
+        Returns the BLAKE2 digest of the file contents.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file, 'rb') as data:
+        for block in iter(lambda: data.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+class SnapshotCache:
+    """
+        Keeps a binary snapshot of the validated rows of every loaded file: a small header describing
+        the source file followed by the rows. A snapshot is used as is, without validation, while the size,
+        modification time and hash of its source file are unchanged, otherwise the file is parsed again
+        and the snapshot rewritten. The file is hashed only when its size and modification time match.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+
+    def path_of(self, file, cls):
+        """
+            Returns the snapshot path of the file loaded as the specified class,
+            next to the file unless the cache has its own directory.
+        """
+        name = f'{os.path.basename(file)}.{cls.__name__}.snapshot'
+        return os.path.join(self.directory or os.path.dirname(file), name)
+
+    def read_rows(self, file, cls, workers=None):
+        """
+            Returns the (offset, values) rows and the rejected (offset, field count, line) rows of the file,
+            from its snapshot when it is fresh, otherwise from a new parse that refreshes the snapshot.
+        """
+        stat = os.stat(file)
+        source = (SNAPSHOT_VERSION, cls.__qualname__, os.path.abspath(file), stat.st_size, stat.st_mtime_ns)
+        path = self.path_of(file, cls)
+
+        snapshot = SnapshotCache._read(path, source, file)
+        if snapshot is not None:
+            return snapshot
+
+        rows, rejected = parse_file(file, cls, workers)
+        SnapshotCache._write(path, source + (file_digest(file),), (rows, rejected))
+        return rows, rejected
+
+    def load(self, file, cls, workers=None, rejects=None):
+        """
+            Loads the file through its snapshot and creates instances of the specified class.
+            Rejected rows go to the `rejects` collector, without one their summary is printed.
+        """
+        try:
+            rows, rejected = self.read_rows(file, cls, workers)
+        except FileNotFoundError:
+            print(f"Ошибка: файл не найден.")
+            return []
+
+        RejectCollector.route(rejects, cls, file, rejected)
+        return RowDecoder.for_class(cls).build_rows(file, rows)
+
+    @staticmethod
+    def _read(path, source, file):
+        """
+            Returns the (rows, rejected) stored in a snapshot taken of the file in the `source` state,
+            or None if it is missing, unreadable or stale. The stat fields of the header are compared first,
+            the file is hashed only when they match and the rows are read only when the hash matches too.
+        """
+        try:
+            with open(path, 'rb') as data:
+                header = marshal.load(data)
+                if not isinstance(header, tuple) or header[:-1] != source or header[-1] != file_digest(file):
+                    return None
+                snapshot = marshal.loads(data.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return snapshot if isinstance(snapshot, tuple) and len(snapshot) == 2 else None
+
+    @staticmethod
+    def _write(path, header, snapshot):
+        """
+            Atomically replaces the snapshot at the given path with the header followed by the rows.
+        """
+        temp = None
+        try:
+            handle, temp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+            with os.fdopen(handle, 'wb') as data:
+                marshal.dump(header, data)
+                marshal.dump(snapshot, data)
+            os.replace(temp, path)
+        except OSError:
+            print(f"Ошибка: не удалось записать снимок {path}.")
+            if temp is not None and os.path.exists(temp):
+                os.remove(temp)
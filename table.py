@@ -0,0 +1,131 @@
+from array import array
+from person import Person
+from patient import Patient
+from employee import Employee
+from decoder import RowDecoder, PLAIN_FIELDS
+from batch import validate_rows
+
+
+class CodedColumn:
+    """
+        Column that stores every distinct value once in a pool and keeps only integer codes per row.
+    """
+
+    def __init__(self, typecode):
+        self.codes = array(typecode)
+        self.pool = []
+        self.index = {}
+
+    def code_of(self, value):
+        """
+            Returns the code of a value, or None if the column never held it.
+        """
+        return self.index.get(value)
+
+    def append(self, value):
+        """
+            Appends a value, adding it to the pool on first occurrence.
+        """
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.pool)
+            self.pool.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, row):
+        return self.pool[self.codes[row]]
+
+    def __iter__(self):
+        pool = self.pool
+        return (pool[code] for code in self.codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+
+class RecordTable:
+    """
+        Columnar storage of the records of one class: small-domain fields are stored as one-byte codes,
+        every other field goes into a shared string pool.
+    """
+
+    BASE_CLASS = Person
+    SMALL_DOMAIN_FIELDS = {'gender', 'level_education'}
+
+    def __init__(self, cls):
+        if not issubclass(cls, self.BASE_CLASS):
+            raise TypeError(f'{type(self).__name__} хранит только {self.BASE_CLASS.__name__}, а не {cls.__name__}')
+
+        self.cls = cls
+        self.decoder = RowDecoder.for_class(cls)
+        self.ids = array('Q')
+        self.columns = {}
+        for field in self.decoder.fields:
+            small = field in self.SMALL_DOMAIN_FIELDS or PLAIN_FIELDS.get(field) is Person._as_bool
+            self.columns[field] = CodedColumn('B' if small else 'L')
+        self._order = [self.columns[field] for field in self.decoder.fields]
+
+    def append_rows(self, file, rows):
+        """
+            Validates a batch of (offset, split row) rows of the file column by column
+            and appends every validated column at once.
+        """
+        allocate = Person._row_allocator(len(rows)).allocate
+        self.ids.extend(allocate((file, offset)) for offset, _ in rows)
+        for column, values in zip(self._order, validate_rows(self.cls, [args for _, args in rows])):
+            for value in values:
+                column.append(value)
+
+    def column(self, field):
+        """
+            Returns the column of the specified field.
+        """
+        return self.columns[field]
+
+    def rows_where(self, field, value):
+        """
+            Returns the numbers of rows where the field equals the value, comparing codes only.
+        """
+        column = self.columns[field]
+        code = column.code_of(value)
+        if code is None:
+            return []
+        return [row for row, current in enumerate(column.codes) if current == code]
+
+    def row(self, row):
+        """
+            Materializes an instance of the table class for the specified row.
+        """
+        return self.decoder.build([column[row] for column in self._order], self.ids[row])
+
+    def __getitem__(self, row):
+        return self.row(row)
+
+    def __iter__(self):
+        return (self.row(row) for row in range(len(self.ids)))
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class PatientTable(RecordTable):
+    """
+        Columnar storage of hospital or ambulatory patients.
+    """
+
+    BASE_CLASS = Patient
+    SMALL_DOMAIN_FIELDS = RecordTable.SMALL_DOMAIN_FIELDS | {
+        'status', 'blood_type', 'rhesus_affiliation',
+        'territorial_number', 'disability', 'health_group',
+    }
+
+
+class StaffTable(RecordTable):
+    """
+        Columnar storage of doctors or nurses.
+    """
+
+    BASE_CLASS = Employee
+    SMALL_DOMAIN_FIELDS = RecordTable.SMALL_DOMAIN_FIELDS | {
+        'year_graduation', 'profession', 'work_experience', 'category',
+    }
@@ -0,0 +1,76 @@
+import mmap
+import os
+
+
+class TailState:
+    """
+        Remembers how far a registry file was consumed, so rows appended later can be parsed alone.
+        Samples of the first bytes and of the bytes right before the consumed offset are kept
+        to notice a file that was truncated or rewritten in the meantime.
+    """
+
+    SAMPLE_SIZE = 64
+
+    def __init__(self, file, offset, inode, head, tail):
+        self.file = file
+        self.offset = offset
+        self.inode = inode
+        self.head = head
+        self.tail = tail
+
+    @staticmethod
+    def capture(file, before):
+        """
+            Returns the state of a file that was fully loaded, `before` is its os.stat taken
+            before the load. Returns None if the file changed during the load.
+        """
+        try:
+            after = os.stat(file)
+        except FileNotFoundError:
+            return None
+        if (before.st_ino, before.st_size, before.st_mtime_ns) != (after.st_ino, after.st_size, after.st_mtime_ns):
+            return None
+        return TailState.at(file, after.st_size)
+
+    @staticmethod
+    def at(file, offset):
+        """
+            Returns the state of a file consumed up to the given offset.
+        """
+        with open(file, 'rb') as data:
+            inode = os.fstat(data.fileno()).st_ino
+            head = data.read(TailState.SAMPLE_SIZE)
+            data.seek(max(0, offset - TailState.SAMPLE_SIZE))
+            tail = data.read(offset - data.tell())
+        return TailState(file, offset, inode, head, tail)
+
+    def new_range(self):
+        """
+            Returns the (start, end) byte range of the complete lines appended since the state
+            was taken, or None if the file was truncated or rewritten and has to be loaded again.
+        """
+        with open(self.file, 'rb') as data:
+            stat = os.fstat(data.fileno())
+            if stat.st_ino != self.inode or stat.st_size < self.offset:
+                return None
+            if data.read(len(self.head)) != self.head:
+                return None
+            data.seek(self.offset - len(self.tail))
+            if data.read(len(self.tail)) != self.tail:
+                return None
+            if stat.st_size == self.offset:
+                return self.offset, self.offset
+
+            start = self.offset
+            last = self.tail[-1:]
+            with mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if last == b'\r' and view[start:start + 1] == b'\n':
+                    start += 1
+                elif last not in (b'', b'\r', b'\n'):
+                    # the last consumed line had no newline yet, only a newline may follow it
+                    if view[start:start + 1] not in (b'\n', b'\r'):
+                        return None
+                    start += 2 if view[start:start + 2] == b'\r\n' else 1
+                end = view.rfind(b'\n', start, stat.st_size) + 1
+
+        return start, max(start, end)
@@ -0,0 +1,45 @@
+import os
+import unittest
+from batch import COLUMN_CHECKS, validate_column, validate_rows
+from decoder import RowDecoder
+from loader import Loader
+from hospital_patient import HospitalPatient
+from ambulatory_patient import AmbulatoryPatient
+from nurse import Nurse
+from doctor import Doctor
+from tests.test_loader import ROOT
+
+CLASSES = (HospitalPatient, AmbulatoryPatient, Nurse, Doctor)
+
+# Raw values of every kind the row splitter produces, plus a few the setters may be called with directly.
+ODD_VALUES = ['', ' ', '0', '1', '7', '20', '21', '-1', ' 12 ', '1950', '2031', 'I', 'IV', '+', '2', 'муж.',
+              'высшее', 'высшая', '12.07.1991', '5004 276159 04.09.2017', '+7(923)190-57-68', True, False,
+              None, 5, 1.5]
+
+
+class ColumnCheckTest(unittest.TestCase):
+
+    def test_every_validator_has_a_column_version(self):
+        for cls in CLASSES:
+            decoder = RowDecoder.for_class(cls)
+            for field, check in zip(decoder.fields, decoder.validators):
+                with self.subTest(cls=cls.__name__, field=field):
+                    self.assertIn(check, COLUMN_CHECKS)
+
+    def test_column_versions_return_what_the_checks_return(self):
+        for check in COLUMN_CHECKS:
+            with self.subTest(check=check.__qualname__):
+                expected = [check(value) for value in ODD_VALUES]
+                self.assertEqual(validate_column(check, ODD_VALUES), expected)
+
+    def test_validated_rows_match_decoded_objects(self):
+        for cls, file in zip(CLASSES, ('hospital.txt', 'ambulatory.txt', 'nurses.txt', 'doctors.txt')):
+            decoder = RowDecoder.for_class(cls)
+            rows = [args for _, args in Loader.iter_rows(os.path.join(ROOT, file), cls)]
+            with self.subTest(cls=cls.__name__):
+                self.assertEqual(list(map(list, zip(*validate_rows(cls, rows)))),
+                                 [decoder.validate(args) for args in rows])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import unittest
+from bloom import BloomFilter, KeyFilter
+from hospital_patient import HospitalPatient
+from loader import Loader
+from registry import Registry
+from tests.test_loader import ROOT
+
+
+class Keys:
+    """
+        Stand-in for a registry object with only the keys the filter reads.
+    """
+
+    def __init__(self, passport=None, medical_policy=None):
+        self.passport = passport
+        self.medical_policy = medical_policy
+
+
+def passport(i):
+    return f'{i // 1000000:04} {i % 1000000:06}'
+
+
+class BloomFilterTest(unittest.TestCase):
+
+    def test_added_keys_are_always_found(self):
+        bloom = BloomFilter(1000)
+        keys = [('passport', str(i)) for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        missing = sum(('passport', str(i)) in bloom for i in range(1000, 11000))
+        self.assertLess(missing / 10000, 3 * bloom.error_rate)
+
+    def test_probes_come_from_one_hash(self):
+        first, step = BloomFilter.digest('key')
+        self.assertEqual((first, step), (hash('key') & 0xFFFFFFFF, (hash('key') >> 32) | 1))
+        self.assertEqual(step % 2, 1)
+
+
+class KeyFilterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.filter = KeyFilter()
+        self.count = KeyFilter.INITIAL_CAPACITY * 6
+        for i in range(self.count):
+            self.filter.add(Keys(passport(i), f'54{i:014}' if i % 2 else None))
+
+    def test_no_false_negatives_across_layers(self):
+        self.assertGreater(len(self.filter.layers), 1)
+        for i in range(self.count):
+            self.assertTrue(self.filter.might_contain('passport', passport(i)))
+            self.assertTrue(self.filter.might_contain('passport', ' ' + passport(i).replace(' ', '  ')))
+        self.assertTrue(self.filter.might_contain('medical_policy', f'54{1:014}'))
+        self.assertFalse(self.filter.might_contain('passport', None))
+
+    def test_stats_count_checks_and_false_positives(self):
+        keys = len(self.filter)
+        self.filter.add(Keys(passport(0)))
+        self.assertEqual(len(self.filter), keys)
+        passed = sum(self.filter.might_contain('passport', passport(i)) for i in range(self.count, self.count + 1000))
+        for _ in range(passed):
+            self.filter.record_miss()
+        stats = self.filter.stats()
+        self.assertEqual((stats['keys'], stats['checks'], stats['passed']), (len(self.filter), 1000, passed))
+        self.assertEqual(stats['false_positives'], passed)
+        self.assertEqual(stats['observed_false_positive_rate'], passed / 1000)
+        self.assertLess(stats['expected_false_positive_rate'], 2 * self.filter.error_rate)
+        self.assertEqual(stats['bytes'], sum(layer.memory() for layer in self.filter.layers))
+
+
+class PrefilterTest(unittest.TestCase):
+
+    def test_prefilter_does_not_change_answers(self):
+        objects = Loader.loader(os.path.join(ROOT, 'hospital.txt'), HospitalPatient)
+        registry = Registry(objects, HospitalPatient)
+        self.assertEqual(registry.registered(objects[0].passport), [objects[0]])
+        self.assertIn('known_keys', registry.lazy_indexes)
+        for obj in objects[:5]:
+            self.assertEqual(registry.registered(obj.passport, prefilter=True), registry.registered(obj.passport))
+            self.assertIn(obj, registry.registered(medical_policy=obj.medical_policy, prefilter=True))
+        checks = registry.index('known_keys').stats()['checks']
+        self.assertEqual(registry.registered('0000 000000', prefilter=True), [])
+        self.assertEqual(registry.index('known_keys').stats()['checks'], checks + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from datetime import date
+from dedup import hash_join, join_keys, match_patient_files
+from tests.test_loader import TempDirTest, sample_lines
+from tests.test_validators import with_fields
+
+
+def record(full_name=None, birthday=None, passport=None, phone_number=None, medical_policy=None):
+    return {'full_name': full_name, 'birthday': birthday, 'passport': passport,
+            'phone_number': phone_number, 'medical_policy': medical_policy}
+
+
+class JoinKeysTest(unittest.TestCase):
+
+    def test_keys_are_built_from_dirty_values(self):
+        keys = join_keys(record('Исаеткаримов  Фархат', '13.07.1979 ', '500б 252044 11.02.2007', None, '54 00'))
+        self.assertEqual(keys['passport'], '5006252044')
+        self.assertEqual(keys['medical_policy'], '5400')
+        self.assertEqual(keys['name_birthday'], ('исаеткаримов фархат', date(1979, 7, 13).toordinal()))
+        self.assertEqual(join_keys(record('Фомин', '13 июля 1979'))['name_birthday'],
+                         ('фомин', date(1979, 7, 13).toordinal()))
+
+    def test_keys_missing_or_unreadable_are_left_out(self):
+        self.assertEqual(join_keys(record('Фомин', '31.02.1979', '5004 2520', 12)), {})
+
+
+class HashJoinTest(unittest.TestCase):
+
+    def setUp(self):
+        self.left = [('a', record('Фомин Владлен', '01.02.1990', '5004 111111', '+7(913)000-00-01')),
+                     ('b', record('Уварова Ариадна', '03.04.1985', '5004 222222'))]
+
+    def test_pairs_share_a_key(self):
+        right = [('x', record('Фомин Владлен', '1 февраля 1990', '5004 111111', '8 913 000 00 01')),
+                 ('y', record('Кто-то Другой', '01.01.2000', '5004 333333'))]
+        pairs = list(hash_join(self.left, right))
+        self.assertEqual([(pair.left, pair.right) for pair in pairs], [('a', 'x')])
+        self.assertCountEqual(pairs[0].matched, ('passport', 'name_birthday'))
+        self.assertFalse(pairs[0].is_conflict)
+
+    def test_conflicting_keys_and_phones_are_reported(self):
+        right = [('x', record('уварова  ариадна', '03.04.1985', '5004 999999')),
+                 ('y', record(None, None, '5004 111111', '+7(913)000-00-02'))]
+        pairs = {pair.right: pair for pair in hash_join(self.left, right)}
+        self.assertEqual((pairs['x'].left, pairs['x'].matched, pairs['x'].conflicts),
+                         ('b', ('name_birthday',), ('passport',)))
+        self.assertEqual((pairs['y'].left, pairs['y'].conflicts), ('a', ('phone_number',)))
+        self.assertTrue(pairs['y'].is_conflict)
+
+
+class PatientFilesTest(TempDirTest):
+
+    def test_rows_of_the_same_person_are_paired_by_offset(self):
+        hospital = sample_lines('hospital.txt')[:2]
+        person = hospital[1].split(';')
+        ambulatory = [sample_lines('ambulatory.txt')[0],
+                      with_fields(sample_lines('ambulatory.txt')[1],
+                                  {0: person[0], 2: person[2], 5: person[5], 8: '+7(962)297-41-10'})]
+        pairs = list(match_patient_files(self.write('hospital.txt', ''.join(hospital)),
+                                         self.write('ambulatory.txt', ''.join(ambulatory))))
+        self.assertEqual(len(pairs), 1)
+        self.assertEqual(pairs[0].left, len(hospital[0].encode('utf-8')))
+        self.assertEqual(pairs[0].right, len(ambulatory[0].encode('utf-8')))
+        self.assertCountEqual(pairs[0].matched, ('passport', 'name_birthday'))
+        self.assertEqual(pairs[0].conflicts, ('medical_policy', 'phone_number'))
+        self.assertEqual(pairs[0].left_values['passport'], person[5])
+
+
+if __name__ == '__main__':
+    unittest.main()
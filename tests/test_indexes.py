@@ -0,0 +1,156 @@
+import unittest
+from indexes import Between, InvertedIndex, NGramIndex, OccupancyIndex, SortedIndex
+
+
+class Record:
+    """
+        Stand-in for a registry object, hashed by identity like Person.
+    """
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+def patient(department, room):
+    return Record(medical_department=department, room_number=room)
+
+
+class OccupancyIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = OccupancyIndex()
+        self.first = patient('Хирургия', '101')
+        self.second = patient(' хирургия ', '101 ')
+        self.third = patient('Хирургия', '102')
+        self.other = patient('Терапия', '5')
+        for obj in (self.first, self.second, self.third, self.other, patient(None, '1')):
+            self.index.add(obj)
+
+    def test_rooms_and_totals_ignore_case_and_spacing(self):
+        self.assertEqual(self.index.occupied('ХИРУРГИЯ'), 3)
+        self.assertEqual(self.index.rooms('хирургия'), {'101': 2, '102': 1})
+        self.assertEqual(self.index.patients('Хирургия', ' 101'), [self.first, self.second])
+        self.assertEqual(self.index.occupied('Неврология'), 0)
+        self.assertEqual(len(self.index), 2)
+
+    def test_remove_drops_empty_rooms_and_departments(self):
+        self.index.remove(self.third)
+        self.assertEqual(self.index.rooms('Хирургия'), {'101': 2})
+        self.index.remove(self.third)
+        self.assertEqual(self.index.occupied('Хирургия'), 2)
+        self.index.remove(self.other)
+        self.assertEqual(self.index.occupied('Терапия'), 0)
+        self.assertEqual(len(self.index), 1)
+
+    def test_estimate_declines_non_department_predicates(self):
+        self.assertEqual(self.index.estimate('medical_department', 'хирургия'), 3)
+        self.assertIsNone(self.index.estimate('room_number', '101'))
+        self.assertIsNone(self.index.estimate('medical_department', None))
+        self.assertIsNone(self.index.estimate('medical_department', Between('А', 'Я')))
+        self.assertCountEqual(self.index.select('medical_department', 'Хирургия'),
+                              [self.first, self.second, self.third])
+
+
+class SortedIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SortedIndex(lambda obj: obj.age, 'age')
+        self.objects = [Record(age=age) for age in (40, 25, None, 60, 25)]
+        for obj in self.objects:
+            self.index.add(obj)
+
+    def test_range_and_top_follow_key_order(self):
+        self.assertEqual([obj.age for obj in self.index.range(25, 40)], [25, 25, 40])
+        self.assertEqual([obj.age for obj in self.index.range(low=41)], [60])
+        self.assertEqual([obj.age for obj in self.index.range(high=24)], [])
+        self.assertEqual([obj.age for obj in self.index.top(2)], [60, 40])
+        self.assertEqual(self.index.top(0), [])
+        self.assertEqual(len(self.index), 4)
+
+    def test_objects_added_after_a_query_are_merged(self):
+        self.index.range()
+        late = Record(age=30)
+        self.index.add(late)
+        self.assertEqual(self.index.range(26, 39), [late])
+
+    def test_remove_takes_out_only_that_object(self):
+        self.index.remove(self.objects[4])
+        self.assertEqual(self.index.range(25, 25), [self.objects[1]])
+        self.index.remove(self.objects[2])
+        self.assertEqual(len(self.index), 3)
+
+    def test_estimate_counts_exact_and_range_predicates(self):
+        self.assertEqual(self.index.estimate('age', 25), 2)
+        self.assertEqual(self.index.estimate('age', Between(30)), 2)
+        self.assertIsNone(self.index.estimate('age', None))
+        self.assertIsNone(self.index.estimate('age', 'двадцать'))
+        self.assertIsNone(self.index.estimate('weight', 25))
+
+
+class NGramIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = NGramIndex()
+        self.people = [Record(full_name=name) for name in
+                       ('Журавлёв Велорий Авксентьевич', 'Журавлева Грета Федотовна',
+                        'Сафонов Лев Артемович', 'Сафонова Лена Артемовна', None)]
+        for obj in self.people:
+            self.index.add(obj)
+
+    def test_search_ranks_the_closest_name_first(self):
+        found = self.index.search('журавлев велорий авксентьеич')
+        self.assertIs(found[0][1], self.people[0])
+        self.assertEqual([obj for _, obj in self.index.search('Сафонов Лев Артемович', 1)], [self.people[2]])
+        self.assertEqual(self.index.search('Сафонов Лев Артемович')[0][0], 1.0)
+        self.assertEqual(self.index.search('щщщ'), [])
+        self.assertEqual(len(self.index), 4)
+
+    def test_common_trigrams_are_skipped_for_candidates(self):
+        self.assertIn(self.people[2], [obj for _, obj in self.index.search('Сафонова Лена')])
+        self.index.COMMON_SHARE, self.index.COMMON_MIN = 0, 1
+        self.assertEqual([obj for _, obj in self.index.search('Сафонова Лена')], [self.people[3]])
+
+    def test_prefix_is_alphabetical(self):
+        self.assertEqual(self.index.prefix('ЖУРАВЛЁ'), [self.people[0], self.people[1]])
+        self.assertEqual(self.index.prefix('сафонов', 1), [self.people[2]])
+        self.assertEqual(self.index.prefix('Сафонова Лена Артемовна Х'), [])
+        self.assertEqual(self.index.prefix(''), [])
+
+    def test_remove_recomputes_trigrams(self):
+        self.index.remove(self.people[0])
+        self.index.remove(self.people[4])
+        self.assertEqual(self.index.prefix('журавл'), [self.people[1]])
+        self.assertNotIn('вел', self.index.postings)
+        self.assertEqual(len(self.index), 3)
+
+
+class InvertedIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = InvertedIndex(('allergies', 'chronic_diagnosis'))
+        self.dust = Record(allergies='Пыль, клещи', chronic_diagnosis=None)
+        self.pollen = Record(allergies='пыльца', chronic_diagnosis='Ёлочная аллергия')
+        self.none = Record(allergies='нет', chronic_diagnosis='')
+        for obj in (self.dust, self.pollen, self.none):
+            self.index.add(obj)
+
+    def test_exact_and_prefix_terms(self):
+        self.assertEqual(self.index.find('ПЫЛЬ'), [self.dust])
+        self.assertCountEqual(self.index.find('пыль', prefix=True), [self.dust, self.pollen])
+        self.assertEqual(self.index.find('елочная'), [self.pollen])
+        self.assertEqual(self.index.find(''), [])
+
+    def test_all_or_any_terms(self):
+        self.assertEqual(self.index.find('клещи пыль'), [self.dust])
+        self.assertEqual(self.index.find('клещи пыльца'), [])
+        self.assertCountEqual(self.index.find('клещи пыльца', match_all=False), [self.dust, self.pollen])
+
+    def test_remove_drops_unused_terms(self):
+        self.index.remove(self.pollen)
+        self.assertEqual(self.index.find('пыль', prefix=True), [self.dust])
+        self.assertNotIn('пыльца', self.index.vocabulary)
+        self.assertNotIn('аллергия', self.index.postings)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from ids import CounterAllocator
+from person import Person
+from hospital_patient import HospitalPatient
+from nurse import Nurse
+from loader import Loader
+from snapshot import SnapshotCache
+import snapshot
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sample_lines(name):
+    """
+        Returns the non-empty lines of a sample registry file, each ending with a newline.
+    """
+    with open(os.path.join(ROOT, name), 'r', encoding='utf-8') as data:
+        return [line.rstrip('\n') + '\n' for line in data if line.strip()]
+
+
+def name_of(line):
+    """
+        Returns the full name of a registry line as the objects store it, cut to 25 characters.
+    """
+    return line.split(';')[0][:25]
+
+
+class TempDirTest(unittest.TestCase):
+    """
+        Runs every test in a fresh directory with its own person numbering and silenced output.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.allocator = Person.id_allocator
+        Person.id_allocator = CounterAllocator()
+        self.output = redirect_stdout(io.StringIO())
+        self.output.__enter__()
+
+    def tearDown(self):
+        self.output.__exit__(None, None, None)
+        Person.id_allocator = self.allocator
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text, mode='w'):
+        """
+            Writes the text to a file of the test directory and returns its path.
+        """
+        path = os.path.join(self.directory, name)
+        with open(path, mode + 'b') as data:
+            data.write(text.encode('utf-8'))
+        return path
+
+
+class ReloadTest(TempDirTest):
+
+    def setUp(self):
+        super().setUp()
+        self.lines = sample_lines('nurses.txt')
+        self.loader = Loader()
+
+    def load(self, text):
+        path = self.write('nurses.txt', text)
+        self.loader.load_nurses(path)
+        return path
+
+    def names(self):
+        return [nurse.full_name for nurse in self.loader.nurses]
+
+    def test_appended_line(self):
+        self.load(''.join(self.lines[:3]))
+        self.write('nurses.txt', self.lines[3], 'a')
+        added, reloaded = self.loader.reload('nurses')
+        self.assertFalse(reloaded)
+        self.assertEqual([nurse.full_name for nurse in added], [name_of(self.lines[3])])
+        self.assertEqual(len(self.loader.nurses), 4)
+        self.assertEqual(self.loader.reload('nurses'), ([], False))
+        self.assertEqual(self.loader.nurses.where(full_name=added[0].full_name).all(), added)
+
+    def test_partial_last_line_waits_for_its_newline(self):
+        self.load(''.join(self.lines[:2]))
+        half = len(self.lines[2]) // 2
+        self.write('nurses.txt', self.lines[2][:half], 'a')
+        self.assertEqual(self.loader.reload('nurses'), ([], False))
+        self.write('nurses.txt', self.lines[2][half:], 'a')
+        added, reloaded = self.loader.reload('nurses')
+        self.assertFalse(reloaded)
+        self.assertEqual(len(added), 1)
+        self.assertEqual(self.names(), [name_of(line) for line in self.lines[:3]])
+
+    def test_crlf_lines(self):
+        self.load(''.join(line.replace('\n', '\r\n') for line in self.lines[:2]))
+        self.write('nurses.txt', self.lines[2].replace('\n', '\r\n'), 'a')
+        added, reloaded = self.loader.reload('nurses')
+        self.assertFalse(reloaded)
+        self.assertEqual(len(added), 1)
+        self.assertEqual(added[0].full_name, name_of(self.lines[2]))
+
+    def test_truncated_file_is_loaded_again(self):
+        self.load(''.join(self.lines[:4]))
+        self.write('nurses.txt', ''.join(self.lines[:2]))
+        added, reloaded = self.loader.reload('nurses')
+        self.assertTrue(reloaded)
+        self.assertEqual(added, list(self.loader.nurses))
+        self.assertEqual(self.names(), [name_of(line) for line in self.lines[:2]])
+
+    def test_rewritten_file_is_loaded_again(self):
+        self.load(''.join(self.lines[:3]))
+        self.write('nurses.txt', ''.join(reversed(self.lines[:4])))
+        added, reloaded = self.loader.reload('nurses')
+        self.assertTrue(reloaded)
+        self.assertEqual(self.names(), [name_of(line) for line in reversed(self.lines[:4])])
+
+    def test_not_loaded_registry(self):
+        self.assertEqual(self.loader.reload('nurses'), ([], True))
+
+
+class ParallelTest(TempDirTest):
+
+    def numbered(self, path, workers=None):
+        Person.id_allocator = CounterAllocator()
+        return [(obj._Person__id, str(obj)) for obj in Loader.loader(path, HospitalPatient, workers)]
+
+    def test_parallel_load_numbers_like_sequential(self):
+        lines = sample_lines('hospital.txt')
+        path = self.write('hospital.txt', ''.join(lines[i % len(lines)] for i in range(500)))
+        with mock.patch('parallel.MIN_CHUNK_SIZE', 4096):
+            parallel = self.numbered(path, 3)
+        self.assertEqual(parallel, self.numbered(path))
+
+    def test_load_all_numbers_like_consecutive_loads(self):
+        paths = {name: os.path.join(ROOT, file) for name, file in (
+            ('hospital_patients', 'hospital.txt'), ('nurses', 'nurses.txt'), ('doctors', 'doctors.txt'))}
+        sequential = Loader()
+        for name, path in paths.items():
+            sequential._load(name, path)
+        Person.id_allocator = CounterAllocator()
+        concurrent = Loader()
+        concurrent.load_all(paths)
+        for name in paths:
+            self.assertEqual([obj._Person__id for obj in getattr(concurrent, name)],
+                             [obj._Person__id for obj in getattr(sequential, name)])
+
+
+class SnapshotTest(TempDirTest):
+
+    def setUp(self):
+        super().setUp()
+        self.lines = sample_lines('hospital.txt')
+        self.path = self.write('hospital.txt', ''.join(self.lines[:5]))
+        self.cache = SnapshotCache(self.directory)
+
+    def test_fresh_snapshot_is_not_parsed(self):
+        rows = self.cache.read_rows(self.path, HospitalPatient)
+        with mock.patch('snapshot.parse_file', side_effect=AssertionError('parsed again')):
+            self.assertEqual(self.cache.read_rows(self.path, HospitalPatient), rows)
+
+    def test_changed_file_is_parsed_again(self):
+        before, _ = self.cache.read_rows(self.path, HospitalPatient)
+        self.write('hospital.txt', self.lines[5], 'a')
+        after, _ = self.cache.read_rows(self.path, HospitalPatient)
+        self.assertEqual(after[:-1], before)
+        self.assertEqual(after[-1][1][0], name_of(self.lines[5]))
+
+    def test_same_size_and_time_with_other_content_is_parsed_again(self):
+        before, _ = self.cache.read_rows(self.path, HospitalPatient)
+        stat = os.stat(self.path)
+        swapped = ''.join(self.lines[:5][::-1])
+        self.write('hospital.txt', swapped)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        after, _ = self.cache.read_rows(self.path, HospitalPatient)
+        self.assertEqual([values for _, values in after], [values for _, values in before][::-1])
+
+    def test_stale_stat_is_not_hashed(self):
+        self.cache.read_rows(self.path, HospitalPatient)
+        os.utime(self.path, ns=(1, 1))
+        digests = []
+        digest = snapshot.file_digest
+        with mock.patch('snapshot.file_digest', side_effect=lambda file: digests.append(file) or digest(file)):
+            self.cache.read_rows(self.path, HospitalPatient)
+        self.assertEqual(len(digests), 1)
+
+    def test_other_class_has_its_own_snapshot(self):
+        self.cache.read_rows(self.path, HospitalPatient)
+        self.assertNotEqual(self.cache.path_of(self.path, HospitalPatient), self.cache.path_of(self.path, Nurse))
+
+
+class RejectsTest(TempDirTest):
+
+    def test_load_all_counts_rejects_per_registry(self):
+        quarantine = os.path.join(self.directory, 'quarantine.txt')
+        loader = Loader(quarantine=quarantine)
+        hospital = sample_lines('hospital.txt')[:3] + ['плохая;строка\n', 'ещё;одна\n']
+        nurses = sample_lines('nurses.txt')[:2] + ['плохая;строка\n']
+        loader.load_all({'hospital_patients': self.write('hospital.txt', ''.join(hospital)),
+                         'nurses': self.write('nurses.txt', ''.join(nurses))})
+        self.assertEqual(loader.rejects['hospital_patients'].total(), 2)
+        self.assertEqual(loader.rejects['nurses'].total(), 1)
+        self.assertEqual(len(loader.hospital_patients), 3)
+        with open(quarantine, 'r', encoding='utf-8') as data:
+            self.assertEqual(data.read(), 'плохая;строка\nещё;одна\nплохая;строка\n')
+
+    def test_iter_rows_reports_when_closed_early(self):
+        path = self.write('hospital.txt', ''.join(['плохая;строка\n'] + sample_lines('hospital.txt')[:3]))
+        with redirect_stdout(io.StringIO()) as output:
+            rows = Loader.iter_rows(path, HospitalPatient)
+            next(rows)
+            self.assertEqual(output.getvalue(), '')
+            rows.close()
+        self.assertIn('Ошибка: отклонено строк: 1', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import os
+import unittest
+from hospital_patient import HospitalPatient
+from loader import Loader
+from quality import profile_file
+from tests.test_loader import ROOT, TempDirTest, sample_lines
+
+
+class ProfileTest(TempDirTest):
+
+    def test_boolean_cells_are_invalid_values(self):
+        fields = sample_lines('hospital.txt')[0].split(';')
+        fields[2], fields[5] = 'да', 'нет'
+        path = self.write('hospital.txt', ';'.join(fields))
+        report = profile_file(path, HospitalPatient)
+        self.assertEqual(report.rows, 1)
+        self.assertEqual(report.fields['birthday'].invalid, 1)
+        self.assertEqual(report.fields['passport'].offenders.top(1), [(False, 1)])
+        patient, = Loader.loader(path, HospitalPatient)
+        self.assertIsNone(patient.birthday)
+        self.assertIsNone(patient.passport)
+        self.assertIsNone(patient.birth_ordinal)
+
+    def test_sample_file_rows(self):
+        path = os.path.join(ROOT, 'hospital.txt')
+        report = profile_file(path, HospitalPatient)
+        self.assertEqual(report.rows, len(Loader.loader(path, HospitalPatient)))
+        self.assertIn('Качество данных', report.text())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from indexes import Between
+from loader import Loader
+from query import Query
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class PlannerTest(unittest.TestCase):
+    """
+        Every query must return exactly the objects a full scan with exact comparisons returns,
+        whichever indexes the planner picks.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loader = Loader()
+        with redirect_stdout(io.StringIO()):
+            for name, file in (('hospital_patients', 'hospital.txt'), ('ambulatory_patients', 'ambulatory.txt'),
+                               ('nurses', 'nurses.txt'), ('doctors', 'doctors.txt')):
+                cls.loader._load(name, os.path.join(ROOT, file))
+
+    def assertPlanFree(self, registry, **predicates):
+        expected = [obj for obj in registry
+                    if all(Query.matches(obj, field, value) for field, value in predicates.items())]
+        self.assertCountEqual(registry.where(**predicates).all(), expected)
+        return expected
+
+    def test_normalized_index_keys_do_not_widen_exact_matches(self):
+        patients = self.loader.hospital_patients
+        department = patients[0].medical_department
+        self.assertTrue(self.assertPlanFree(patients, medical_department=department))
+        self.assertFalse(self.assertPlanFree(patients, medical_department=department.upper()))
+        phone = patients[0].phone_number
+        self.assertTrue(self.assertPlanFree(patients, phone_number=phone))
+        self.assertFalse(self.assertPlanFree(patients, phone_number=''.join(filter(str.isdigit, phone))))
+        doctors = self.loader.doctors
+        self.assertTrue(self.assertPlanFree(doctors, category='высшая'))
+        self.assertFalse(self.assertPlanFree(doctors, category='ВЫСШАЯ'))
+
+    def test_none_matches_missing_values(self):
+        patients = self.loader.hospital_patients
+        self.assertTrue(self.assertPlanFree(patients, passport=None))
+        nurses = self.loader.nurses
+        missing = self.assertPlanFree(nurses, work_experience=None)
+        self.assertEqual([nurse.work_experience for nurse in missing], [None] * len(missing))
+        self.assertTrue(missing)
+        self.assertTrue(self.assertPlanFree(self.loader.doctors, category=None))
+
+    def test_ranges_and_conjunctions(self):
+        nurses = self.loader.nurses
+        self.assertTrue(self.assertPlanFree(nurses, work_experience=Between(10, None)))
+        self.assertTrue(self.assertPlanFree(nurses, work_experience=12))
+        self.assertFalse(self.assertPlanFree(nurses, work_experience='12'))
+        patients = self.loader.hospital_patients
+        first = patients[0]
+        self.assertEqual(self.assertPlanFree(patients, medical_department=first.medical_department,
+                                             passport=first.passport, birth_ordinal=first.birth_ordinal), [first])
+        self.assertFalse(self.assertPlanFree(patients, medical_department=first.medical_department,
+                                             birth_ordinal=Between(None, 0)))
+
+    def test_plan_declines_predicates_without_keys(self):
+        patients = self.loader.hospital_patients
+        indexed, scanned = patients.where(passport=None, birth_ordinal=None).plan()
+        self.assertEqual(indexed, [])
+        self.assertEqual(scanned, [('passport', None), ('birth_ordinal', None)])
+        indexed, _ = patients.where(passport=patients[0].passport).plan()
+        self.assertEqual([name for _, _, _, name, _ in indexed], ['passport'])
+
+    def test_explain(self):
+        patients = self.loader.hospital_patients
+        self.assertTrue(patients.where(passport=patients[0].passport).explain().startswith('индекс passport'))
+        self.assertTrue(patients.where(passport=None).explain().startswith('полный перебор'))
+        self.assertTrue(patients.where().explain().startswith('все'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import unittest
+from datetime import date
+from hospital_patient import HospitalPatient
+from loader import Loader
+from registry import Registry
+from tests.test_loader import ROOT
+
+
+class LazyIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.objects = Loader.loader(os.path.join(ROOT, 'hospital.txt'), HospitalPatient)
+
+    def test_lazy_indexes_are_built_on_first_use(self):
+        registry = Registry(self.objects, HospitalPatient)
+        self.assertNotIn('full_name', registry.indexes)
+        self.assertIn('full_name', registry.lazy_indexes)
+        self.assertIn('passport', registry.indexes)
+        name = self.objects[0].full_name
+        self.assertEqual(registry.search_name(name, 1)[0][1], self.objects[0])
+        self.assertIn('full_name', registry.indexes)
+        self.assertNotIn('full_name', registry.lazy_indexes)
+
+    def test_lazy_and_eager_registries_answer_alike(self):
+        lazy = Registry(self.objects[:-3], HospitalPatient)
+        eager = Registry(self.objects[:-3], HospitalPatient, lazy=())
+        self.assertEqual(eager.lazy_indexes, {})
+        lazy.index('allergies')
+        for registry in (lazy, eager):
+            registry.extend(self.objects[-3:])
+            registry.remove(self.objects[0])
+        self.assertTrue(eager.with_allergy('пыль'))
+        for query in ('пыль', 'сульфанил', 'пыль клещи', 'нет такого'):
+            self.assertEqual(lazy.with_allergy(query), eager.with_allergy(query))
+        first, last = date(2000, 11, 1), date(2000, 6, 30)
+        self.assertEqual(lazy.birthdays_between(first, last), eager.birthdays_between(first, last))
+        name = self.objects[2].full_name
+        self.assertEqual(lazy.search_name(name), eager.search_name(name))
+        self.assertEqual(lazy.registered(self.objects[3].passport), eager.registered(self.objects[3].passport))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import io
+import os
+import unittest
+from decoder import RowDecoder
+from loader import Loader
+from render import render_all, renderer_of
+from hospital_patient import HospitalPatient
+from ambulatory_patient import AmbulatoryPatient
+from nurse import Nurse
+from doctor import Doctor
+from tests.test_loader import ROOT
+
+FILES = ((HospitalPatient, 'hospital.txt'), (AmbulatoryPatient, 'ambulatory.txt'),
+         (Nurse, 'nurses.txt'), (Doctor, 'doctors.txt'))
+
+# Values hitting the conditions of the templates: empty, boolean, the values some lines skip and look-alikes.
+ODD_VALUES = ['', ' ', True, False, 'True', 'False', '0', '1', 'I', 'Диагноз не выявлен', 'Не выявлено', '12']
+
+
+class TemplateTest(unittest.TestCase):
+    """
+        The renderers read the slots and str() reads the properties, both are compiled from the same layouts
+        and must give the same text.
+    """
+
+    def assertRendersLikeStr(self, objects):
+        out = io.StringIO()
+        render_all(objects, out)
+        self.assertEqual(out.getvalue(), ''.join(f'{obj}\n' for obj in objects))
+
+    def test_every_class_is_compiled_from_its_layout(self):
+        for cls, _ in FILES:
+            self.assertIsNot(renderer_of(cls), str)
+
+    def test_class_with_its_own_str_is_rendered_with_str(self):
+        class Labelled(Nurse):
+            __slots__ = ()
+
+            def __str__(self):
+                return 'медсестра\n'
+
+        self.assertIs(renderer_of(Labelled), str)
+
+    def test_sample_files(self):
+        for cls, file in FILES:
+            with self.subTest(cls=cls.__name__):
+                objects = Loader.loader(os.path.join(ROOT, file), cls)
+                self.assertTrue(objects)
+                self.assertRendersLikeStr(objects)
+
+    def test_every_field_with_odd_values(self):
+        for cls, file in FILES:
+            decoder = RowDecoder.for_class(cls)
+            sample = next(args for _, args in Loader.iter_rows(os.path.join(ROOT, file), cls))
+            rows = [[value] * decoder.arity for value in ODD_VALUES]
+            for position in range(decoder.arity):
+                rows.extend(sample[:position] + [value] + sample[position + 1:] for value in ODD_VALUES)
+            with self.subTest(cls=cls.__name__):
+                self.assertRendersLikeStr([decoder.decode(args) for args in rows])
+
+
+if __name__ == '__main__':
+    unittest.main()
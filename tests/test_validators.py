@@ -0,0 +1,75 @@
+import unittest
+from ambulatory_patient import AmbulatoryPatient
+from employee import Employee
+from nurse import Nurse
+from loader import Loader
+from tests.test_loader import TempDirTest, sample_lines
+
+
+def with_fields(line, fields):
+    """
+        Returns a registry line with the values of the given {position: value} fields replaced.
+    """
+    values = line.rstrip('\n').split(';')
+    for position, value in fields.items():
+        values[position] = value
+    return ';'.join(values) + '\n'
+
+
+class EmployeeFieldsTest(TempDirTest):
+    """
+        The year of graduation and work experience are read from the files as digit strings
+        and kept as integers, so they are printed with the employee.
+    """
+
+    def test_file_values_are_printed(self):
+        nurse = Loader.loader(self.write('nurses.txt', sample_lines('nurses.txt')[0]), Nurse)[0]
+        self.assertEqual((nurse.year_graduation, nurse.work_experience), (2012, 8))
+        self.assertIn('\nГод окончания: 2012\n', str(nurse))
+        self.assertIn('\nОпыт работы: 8\n', str(nurse))
+
+    def test_invalid_values_are_not_printed(self):
+        line = with_fields(sample_lines('nurses.txt')[0], {11: '1949', 15: 'восемь'})
+        nurse = Loader.loader(self.write('nurses.txt', line), Nurse)[0]
+        self.assertEqual((nurse.year_graduation, nurse.work_experience), (None, None))
+        self.assertNotIn('Год окончания', str(nurse))
+        self.assertNotIn('Опыт работы', str(nurse))
+
+    def test_validators_take_digit_strings_and_integers_in_range(self):
+        for value, expected in (('2012', 2012), (' 1950 ', 1950), (2030, 2030), ('2031', None),
+                                ('20.12', None), ('', None), (True, None), (None, None)):
+            self.assertEqual(Employee._validate_year_graduation(value), expected, value)
+        for value, expected in (('0', 0), (60, 60), ('61', None), ('-1', None), (False, None)):
+            self.assertEqual(Employee._validate_work_experience(value), expected, value)
+
+
+class AmbulatoryFieldsTest(TempDirTest):
+    """
+        The territorial number, disability group and health group are read from the files as strings
+        and accepted when they are in range or among the listed categories, so they are printed with the patient.
+    """
+
+    def test_file_values_are_printed(self):
+        line = sample_lines('ambulatory.txt')[0]
+        patient = Loader.loader(self.write('ambulatory.txt', line), AmbulatoryPatient)[0]
+        self.assertEqual((patient.territorial_number, patient.disability, patient.health_group), (4, '2', 'III'))
+        self.assertIn('\nТерриториальный номер: 4\nГруппа инвалидности: 2\nГруппа здоровья: III\n', str(patient))
+
+    def test_invalid_values_are_not_printed(self):
+        line = with_fields(sample_lines('ambulatory.txt')[0], {15: '21', 16: '4', 17: 'IV'})
+        patient = Loader.loader(self.write('ambulatory.txt', line), AmbulatoryPatient)[0]
+        self.assertEqual((patient.territorial_number, patient.disability, patient.health_group), (None, None, None))
+        for title in ('Территориальный номер', 'Группа инвалидности', 'Группа здоровья'):
+            self.assertNotIn(title, str(patient))
+
+    def test_validators_take_strings_of_the_file(self):
+        for value, expected in (('1', 1), (20, 20), ('0', None), ('21', None), (True, None)):
+            self.assertEqual(AmbulatoryPatient._validate_territorial_number(value), expected, value)
+        for value, expected in (('0', '0'), ('3', '3'), (2, None), ('II', None)):
+            self.assertEqual(AmbulatoryPatient._validate_disability(value), expected, value)
+        for value, expected in (('I', 'I'), ('iii', None), (1, None)):
+            self.assertEqual(AmbulatoryPatient._validate_health_group(value), expected, value)
+
+
+if __name__ == '__main__':
+    unittest.main()